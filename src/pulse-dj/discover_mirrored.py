@@ -1,13 +1,92 @@
 """LIFX discovery test using WSL mirrored networking mode"""
 
+import asyncio
+import functools
+import select
 import socket
 import struct
 import time
 import sys
-import subprocess
 
 BROADCAST_MAC = "00:00:00:00:00:00"
 HEADER_SIZE = 36
+DEBUG_PACKETS = False  # Dump every unicast packet sent
+
+# Precompiled packet layouts
+_FRAME = struct.Struct("<HHI")          # size, flags/protocol, source
+_FRAME_ADDR = struct.Struct("<Q6sBB")   # target, reserved, flags, sequence
+_PROTO_HDR = struct.Struct("<QHH")      # reserved, type, reserved
+_RESERVED6 = b'\x00' * 6
+_TARGET = struct.Struct("<Q")
+
+# Constant parts of the unicast GetService packet around the target address
+_UNICAST_FRAME = _FRAME.pack(
+    HEADER_SIZE,
+    ((0 & 0b11) << 14) |
+    ((0 & 0b1) << 13) |  # tagged = 0 for unicast
+    ((1 & 0b1) << 12) |
+    (1024 & 0b111111111111),
+    0  # source_id
+)
+_UNICAST_SUFFIX = (
+    _RESERVED6 +
+    bytes([
+        ((0 & 0b111111) << 2) |
+        ((0 & 0b1) << 1) |
+        (1 & 0b1),  # response_required = 1
+        0  # seq_num
+    ]) +
+    _PROTO_HDR.pack(0, 2, 0)  # GetService
+)
+
+async def _run(*cmd):
+    """Run a command and return its exit code and stdout"""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, _ = await proc.communicate()
+    return proc.returncode, stdout.decode(errors='replace')
+
+async def _ping(ip):
+    """Ping a host once with a 1 second timeout"""
+    return await _run('ping', '-c', '1', '-W', '1', ip)
+
+async def _check_network():
+    """Gather interface, routing and connectivity information"""
+    # Get network interfaces
+    _, stdout = await _run('ip', 'addr')
+    print("\nNetwork interfaces:")
+    print(stdout)
+    
+    # Get routing
+    _, stdout = await _run('ip', 'route')
+    print("\nRouting table:")
+    print(stdout)
+    
+    # Try to ping LIFX lights
+    print("\nTesting connectivity to LIFX lights:")
+    lifx_ips = [
+        "192.168.4.14",
+        "192.168.4.23",
+        "192.168.4.13",
+        "192.168.4.15"
+    ]
+    
+    # Ping all lights concurrently
+    results = await asyncio.gather(
+        *(_ping(ip) for ip in lifx_ips),
+        return_exceptions=True
+    )
+    
+    for ip, result in zip(lifx_ips, results):
+        if isinstance(result, Exception):
+            print(f"Error pinging {ip}: {result}")
+            continue
+        returncode, stdout = result
+        print(f"\n{ip}: {'Reachable' if returncode == 0 else 'Unreachable'}")
+        print(stdout)
 
 def check_network():
     """Check network configuration"""
@@ -15,43 +94,14 @@ def check_network():
     print("----------------------------")
     
     try:
-        # Get network interfaces
-        result = subprocess.run(['ip', 'addr'], capture_output=True, text=True)
-        print("\nNetwork interfaces:")
-        print(result.stdout)
-        
-        # Get routing
-        result = subprocess.run(['ip', 'route'], capture_output=True, text=True)
-        print("\nRouting table:")
-        print(result.stdout)
-        
-        # Try to ping LIFX lights
-        print("\nTesting connectivity to LIFX lights:")
-        lifx_ips = [
-            "192.168.4.14",
-            "192.168.4.23",
-            "192.168.4.13",
-            "192.168.4.15"
-        ]
-        
-        for ip in lifx_ips:
-            try:
-                result = subprocess.run(['ping', '-c', '1', '-W', '1', ip], 
-                                     capture_output=True, text=True)
-                print(f"\n{ip}: {'Reachable' if result.returncode == 0 else 'Unreachable'}")
-                print(result.stdout)
-            except Exception as e:
-                print(f"Error pinging {ip}: {e}")
-                
+        asyncio.run(_check_network())
     except Exception as e:
         print(f"Error checking network: {e}")
 
+@functools.lru_cache(maxsize=64)
 def convert_mac_to_int(addr):
     """Convert MAC address to integer (little endian)"""
-    reverse_bytes = addr.split(":")
-    reverse_bytes.reverse()
-    addr_str = "".join(reverse_bytes)
-    return int(addr_str, 16)
+    return int.from_bytes(bytes.fromhex(addr.replace(':', '')), 'little')
 
 def create_discovery_packet():
     """Create a GetService discovery packet according to LIFX protocol"""
@@ -63,8 +113,7 @@ def create_discovery_packet():
     origin = 0
     source_id = 0  # Source identifier
     
-    frame = struct.pack(
-        "<HHI",
+    frame = _FRAME.pack(
         size,           # 16 bits
         ((origin & 0b11) << 14) |
         ((tagged & 0b1) << 13) |
@@ -79,10 +128,9 @@ def create_discovery_packet():
     response_required = 1
     seq_num = 0
     
-    frame_addr = struct.pack(
-        "<Q6sBB",
+    frame_addr = _FRAME_ADDR.pack(
         target_addr,    # 64 bits
-        b'\x00' * 6,    # Reserved 48 bits
+        _RESERVED6,     # Reserved 48 bits
         ((0 & 0b111111) << 2) |
         ((ack_required & 0b1) << 1) |
         (response_required & 0b1),  # 8 bits
@@ -92,8 +140,7 @@ def create_discovery_packet():
     # Protocol Header
     msg_type = 2  # GetService = 2
     
-    protocol_header = struct.pack(
-        "<QHH",
+    protocol_header = _PROTO_HDR.pack(
         0,              # Reserved 64 bits
         msg_type,       # 16 bits
         0               # Reserved 16 bits
@@ -104,7 +151,7 @@ def create_discovery_packet():
     # Debug packet contents
     print("\nDiscovery Packet Details:")
     print(f"Size: {len(packet)} bytes")
-    print(f"Hex: {' '.join([f'{b:02x}' for b in packet])}")
+    print(f"Hex: {packet.hex(' ')}")
     
     return packet
 
@@ -116,7 +163,7 @@ def try_discovery():
     # Create UDP socket
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-    sock.settimeout(1)
+    sock.setblocking(False)
     
     try:
         # Bind to all interfaces
@@ -152,15 +199,18 @@ def try_discovery():
                 print(f"Broadcast packet sent to {addr}")
                 
                 # Listen for responses
-                start_time = time.time()
-                while time.time() - start_time < 2:
-                    try:
-                        data, (ip, port) = sock.recvfrom(1024)
-                        if ip != '192.168.4.17':  # Ignore our own broadcasts
-                            print(f"\nReceived {len(data)} bytes from {ip}:{port}")
-                            print(f"Response: {' '.join([f'{b:02x}' for b in data])}")
-                    except socket.timeout:
-                        continue
+                deadline = time.monotonic() + 2.0
+                while True:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    readable, _, _ = select.select([sock], [], [], timeout)
+                    if not readable:
+                        break
+                    data, (ip, port) = sock.recvfrom(1024)
+                    if ip != '192.168.4.17':  # Ignore our own broadcasts
+                        print(f"\nReceived {len(data)} bytes from {ip}:{port}")
+                        print(f"Response: {data.hex(' ')}")
             except Exception as e:
                 print(f"Error with broadcast to {addr}: {e}")
         
@@ -169,50 +219,26 @@ def try_discovery():
         for mac, ip in known_lights.items():
             print(f"\nTrying {mac} at {ip}")
             try:
-                # Create unicast packet (not tagged)
+                # Create unicast packet (not tagged); only the target varies
                 target_addr = convert_mac_to_int(mac)
-                frame = struct.pack(
-                    "<HHI",
-                    HEADER_SIZE,
-                    ((0 & 0b11) << 14) |
-                    ((0 & 0b1) << 13) |  # tagged = 0 for unicast
-                    ((1 & 0b1) << 12) |
-                    (1024 & 0b111111111111),
-                    0  # source_id
-                )
-                
-                frame_addr = struct.pack(
-                    "<Q6sBB",
-                    target_addr,
-                    b'\x00' * 6,
-                    ((0 & 0b111111) << 2) |
-                    ((0 & 0b1) << 1) |
-                    (1 & 0b1),  # response_required = 1
-                    0  # seq_num
-                )
-                
-                protocol_header = struct.pack(
-                    "<QHH",
-                    0,
-                    2,  # GetService
-                    0
-                )
-                
-                packet = frame + frame_addr + protocol_header
+                packet = _UNICAST_FRAME + _TARGET.pack(target_addr) + _UNICAST_SUFFIX
                 
                 # Send packet
                 sock.sendto(packet, (ip, 56700))
                 print(f"Sent packet to {ip}")
-                print(f"Packet: {' '.join([f'{b:02x}' for b in packet])}")
+                if DEBUG_PACKETS:
+                    print(f"Packet: {packet.hex(' ')}")
                 
                 # Listen for response
                 try:
+                    readable, _, _ = select.select([sock], [], [], 1)
+                    if not readable:
+                        print(f"No response from {ip}")
+                        continue
                     data, addr = sock.recvfrom(1024)
                     if addr[0] != '192.168.4.17':  # Ignore our own broadcasts
                         print(f"Received {len(data)} bytes from {addr[0]}:{addr[1]}")
-                        print(f"Response: {' '.join([f'{b:02x}' for b in data])}")
-                except socket.timeout:
-                    print(f"No response from {ip}")
+                        print(f"Response: {data.hex(' ')}")
                 except Exception as e:
                     print(f"Error receiving from {ip}: {e}")
             except Exception as e:
@@ -0,0 +1,41 @@
+# cython: language_level=3
+"""Compiled band energy and RMS kernel for AudioAnalyzer"""
+
+cimport cython
+from libc.math cimport sqrt
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef double band_energies_and_rms(
+    const float[::1] power,
+    const int[::1] starts,
+    const int[::1] ends,
+    double[::1] out_energies,
+    const float[::1] audio
+):
+    """Sum band energies into out_energies and return the RMS of audio
+
+    Args:
+        power: Normalized power spectrum
+        starts: Band start bin indices
+        ends: Band end bin indices (exclusive)
+        out_energies: Output array receiving one energy per band
+        audio: Mono time-domain samples
+
+    Returns:
+        RMS level of the audio samples
+    """
+    cdef Py_ssize_t b, i
+    cdef Py_ssize_t n = audio.shape[0]
+    cdef double s
+
+    for b in range(starts.shape[0]):
+        s = 0.0
+        for i in range(starts[b], ends[b]):
+            s += power[i]
+        out_energies[b] = s
+
+    s = 0.0
+    for i in range(n):
+        s += audio[i] * audio[i]
+    return sqrt(s / n) if n else 0.0
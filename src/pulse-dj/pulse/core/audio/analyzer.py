@@ -4,10 +4,44 @@ import sounddevice as sd
 import time
 import logging
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+try:
+    # scipy.fft keeps float32 input in single precision and caches plans
+    from scipy import fft as _fft
+except ImportError:
+    _fft = np.fft
+
+try:
+    # Optional compiled kernel (built by setup.py when Cython is available)
+    from ._analyzer import band_energies_and_rms as _compiled_bands_and_rms
+except ImportError:
+    _compiled_bands_and_rms = None
+
+def _bands_and_rms(
+    power: np.ndarray,
+    cuts: np.ndarray,
+    nonempty: np.ndarray,
+    out_energies: np.ndarray,
+    audio: np.ndarray
+) -> float:
+    """Sum band energies into out_energies and return the RMS of audio
+    
+    Args:
+        power: Normalized power spectrum, padded with one trailing zero bin
+        cuts: Interleaved band start/end bin indices for np.add.reduceat
+        nonempty: Per-band mask, zero for bands without any bins
+        out_energies: Output array receiving one energy per band
+        audio: Mono time-domain samples
+        
+    Returns:
+        RMS level of the audio samples
+    """
+    sums = np.add.reduceat(power, cuts)
+    np.multiply(sums[0::2], nonempty, out=out_energies)
+    return float(np.sqrt(np.dot(audio, audio) / audio.size))
+
 class AudioAnalyzer:
     """Real-time audio frequency analyzer"""
     
@@ -24,40 +58,60 @@ class AudioAnalyzer:
         self.sample_rate = sample_rate
         self.window_size = window_size
         self.overlap_samples = int(window_size * overlap)
-        self.window = np.hanning(window_size)
+        self.window = np.hanning(window_size).astype(np.float32)
+        self._windowed = np.empty(window_size, dtype=np.float32)
+        self._power = np.zeros(window_size // 2 + 2, dtype=np.float32)
         self.band_indices = self._calculate_band_indices()
-        self.peak_energy = {band: 0.0 for band in self.FREQ_BANDS.keys()}
+        self._energies = np.zeros(len(self._band_names))
+        self._normalized = np.zeros(len(self._band_names))
+        self._peak = np.zeros(len(self._band_names), dtype=np.float32)
         self.smoothing = 0.2  # Smoothing factor for peak normalization
         
     def _calculate_band_indices(self) -> Dict[str, tuple]:
-        """Calculate FFT frequency band indices"""
+        """Calculate FFT frequency band indices
+        
+        Also stores the band names and start/end bin indices as arrays
+        (in FREQ_BANDS order) for the analysis hot path.
+        
+        Returns:
+            Dictionary mapping band name to (start, end) bin indices
+        """
         freqs = np.fft.rfftfreq(self.window_size, 1.0/self.sample_rate)
-        indices = {}
+        lows = [low for low, _ in self.FREQ_BANDS.values()]
+        highs = [high for _, high in self.FREQ_BANDS.values()]
         
-        for band, (low, high) in self.FREQ_BANDS.items():
-            start = np.searchsorted(freqs, low)
-            end = np.searchsorted(freqs, high)
-            indices[band] = (start, end)
-            
-        return indices
+        self._band_names = list(self.FREQ_BANDS.keys())
+        self._band_starts = starts = np.searchsorted(freqs, lows).astype(np.int32)
+        self._band_ends = ends = np.searchsorted(freqs, highs).astype(np.int32)
+        
+        # Cut points for summing every band in one reduceat pass
+        self._reduceat_idx = np.column_stack((starts, ends)).ravel().astype(np.intp)
+        self._band_nonempty = (ends > starts).astype(np.float64)
+        
+        return {
+            band: (int(start), int(end))
+            for band, start, end in zip(self._band_names, starts, ends)
+        }
+        
+    def _normalize_energies(self, energies: np.ndarray) -> np.ndarray:
+        """Normalize band energies with adaptive peak tracking"""
+        # Update peaks with decay
+        peak = self._peak
+        peak *= (1.0 - self.smoothing)
+        np.maximum(peak, energies, out=peak)
         
-    def _normalize_energy(self, band: str, energy: float) -> float:
-        """Normalize energy value with adaptive peak tracking"""
-        # Update peak with decay
-        self.peak_energy[band] *= (1.0 - self.smoothing)
-        if energy > self.peak_energy[band]:
-            self.peak_energy[band] = energy
-            
         # Normalize and scale up for more dynamic range
-        if self.peak_energy[band] > 0:
-            return min(1.0, (energy / self.peak_energy[band]) * 2.0)
-        return 0.0
+        norm = self._normalized
+        norm.fill(0.0)
+        np.divide(energies, peak, out=norm, where=peak > 0)
+        norm *= 2.0
+        return np.minimum(norm, 1.0, out=norm)
         
     def analyze_frame(self, audio_data: np.ndarray) -> Dict[str, Any]:
         """Analyze a frame of audio data
         
         Args:
-            audio_data: Audio frame data
+            audio_data: Mono audio frame data (frames or frames x 1)
             
         Returns:
             Dictionary containing:
@@ -65,28 +119,34 @@ class AudioAnalyzer:
                 - volume_level: Overall volume level (0-1)
         """
         try:
-            # Convert to mono if stereo
-            if audio_data.ndim > 1:
-                audio_data = np.mean(audio_data, axis=1)
-                
+            # Flatten the single input channel (a view, no copy)
+            mono = audio_data.reshape(-1)
+            
             # Apply window function
-            windowed = audio_data * self.window
+            windowed = np.multiply(mono, self.window, out=self._windowed)
             
-            # Compute FFT
-            magnitudes = np.abs(np.fft.rfft(windowed))
-            magnitudes = magnitudes / len(magnitudes)  # Normalize
+            # Compute normalized power spectrum
+            # (energy of the /N normalized magnitudes, so scale power by 1/N^2)
+            spectrum = _fft.rfft(windowed)
+            power = self._power[:spectrum.size]
+            np.multiply(spectrum.real, spectrum.real, out=power)
+            power += spectrum.imag * spectrum.imag
+            power *= 1.0 / (spectrum.size * spectrum.size)
             
-            # Calculate band energies
-            band_energies = {}
-            for band, (start, end) in self.band_indices.items():
-                # Calculate band energy
-                energy = np.sum(magnitudes[start:end] ** 2)
-                
-                # Normalize energy
-                band_energies[band] = self._normalize_energy(band, energy)
-                
-            # Calculate overall volume level
-            volume_level = float(np.sqrt(np.mean(audio_data ** 2)))
+            # Calculate band energies and overall volume level
+            if _compiled_bands_and_rms is not None and mono.dtype == np.float32 and mono.flags.c_contiguous:
+                volume_level = _compiled_bands_and_rms(
+                    power, self._band_starts, self._band_ends, self._energies, mono
+                )
+            else:
+                volume_level = _bands_and_rms(
+                    self._power, self._reduceat_idx, self._band_nonempty,
+                    self._energies, mono
+                )
+            
+            # Normalize energies
+            norm = self._normalize_energies(self._energies)
+            band_energies = dict(zip(self._band_names, norm.tolist()))
             
             return {
                 'band_energies': band_energies,
@@ -109,35 +169,51 @@ class AudioInput:
         self.stream = None
         self.analyzer = AudioAnalyzer()
         self.loop = None
-        self.executor = ThreadPoolExecutor(max_workers=1)
-        self._running = True
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer_task: Optional[asyncio.Task] = None
+        self._submit: Optional[Callable] = None
+        self._callback: Optional[Callable] = None
         
-        # List available devices on initialization
-        self._list_devices()
+        # Frames handed to / finished by the consumer. Each counter has a
+        # single writer thread, so their difference is the in-flight count.
+        self._submitted = 0
+        self._completed = 0
+        self._running = True
         
     def _list_devices(self):
-        """Log available audio devices"""
+        """Log available audio devices (debug logging only)"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+            
         try:
             devices = sd.query_devices()
-            logger.info("Available audio devices:")
+            logger.debug("Available audio devices:")
             for i, dev in enumerate(devices):
-                logger.info(f"[{i}] {dev['name']} (in={dev['max_input_channels']}, out={dev['max_output_channels']})")
+                logger.debug(f"[{i}] {dev['name']} (in={dev['max_input_channels']}, out={dev['max_output_channels']})")
         except Exception as e:
             logger.error(f"Error listing audio devices: {e}")
         
-    def _run_callback(self, features: Dict[str, Any]):
-        """Run callback in the event loop"""
+    def _enqueue(self, features: Dict[str, Any]):
+        """Queue features for the consumer (runs in the event loop)"""
         if not self._running:
             return
             
-        if self.callback and self.loop:
+        if self._queue.full():
+            # Consumer is behind; drop the oldest frame so the latest wins
+            self._queue.get_nowait()
+            self._completed += 1
+        self._queue.put_nowait(features)
+        
+    async def _consumer(self):
+        """Deliver queued features to the callback"""
+        while self._running:
+            features = await self._queue.get()
             try:
-                # Create a task for the callback
-                asyncio.run_coroutine_threadsafe(
-                    self.callback(features), self.loop
-                )
+                await self._callback(features)
             except Exception as e:
                 logger.error(f"Error in callback: {e}")
+            finally:
+                self._completed += 1
         
     def audio_callback(self, indata, frames, time_info, status):
         """Handle audio input data"""
@@ -145,12 +221,18 @@ class AudioInput:
             if status:
                 logger.warning(f"Audio status: {status}")
                 
-            if self.callback:
+            submit = self._submit
+            if submit is not None:
+                # Skip this frame while the previous one is still being handled
+                if self._submitted - self._completed > 0:
+                    return
+                    
                 # Analyze audio
                 features = self.analyzer.analyze_frame(indata)
                 
-                # Run callback in executor to avoid blocking
-                self.executor.submit(self._run_callback, features)
+                # Hand off to the event loop without blocking
+                submit(self._enqueue, features)
+                self._submitted += 1
                 
         except Exception as e:
             logger.error(f"Error in audio callback: {e}")
@@ -161,15 +243,25 @@ class AudioInput:
             # Store event loop reference
             self.loop = asyncio.get_event_loop()
             
+            # Start feature consumer
+            if self.callback:
+                self._callback = self.callback
+                self._queue = asyncio.Queue(maxsize=4)
+                self._consumer_task = self.loop.create_task(self._consumer())
+                self._submit = self.loop.call_soon_threadsafe
+            
             # Get device info
             if self.device_id is not None:
                 device_info = sd.query_devices(self.device_id)
                 logger.info(f"Using audio device {self.device_id}: {device_info['name']}")
+            else:
+                self._list_devices()
             
             # Create input stream
             self.stream = sd.InputStream(
                 device=self.device_id,
-                channels=2,
+                channels=1,
+                dtype='float32',
                 samplerate=44100,
                 blocksize=2048,
                 callback=self.audio_callback
@@ -195,5 +287,6 @@ class AudioInput:
             except Exception as e:
                 logger.error(f"Error stopping audio capture: {e}")
                 
-        if self.executor:
-            self.executor.shutdown(wait=False)
+        if self._consumer_task:
+            self._consumer_task.cancel()
+            self._consumer_task = None
@@ -3,8 +3,9 @@
 import asyncio
 import logging
 import socket
+import weakref
 import ifaddr
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum, auto
 from aiolifx import LifxDiscovery
@@ -13,53 +14,91 @@ from zeroconf.asyncio import AsyncZeroconf
 
 logger = logging.getLogger(__name__)
 
+def _mac_of(light: Light) -> str:
+    """Get a light's MAC address as a colon separated hex string"""
+    mac = getattr(light, '_pulse_mac_str', None)
+    if mac is None:
+        mac = light.mac_addr
+        if isinstance(mac, bytes):
+            mac = mac.hex(':')
+    return mac
+
 class LightState(Enum):
     """Light power state"""
     OFF = auto()
     ON = auto()
 
-@dataclass
+@dataclass(frozen=True)
 class LightColor:
-    """Light color settings"""
+    """Light color settings (immutable, so instances can be shared)"""
+    __slots__ = ('hue', 'saturation', 'brightness', 'kelvin')
+    
     hue: int         # 0-65535
     saturation: int  # 0-65535
     brightness: int  # 0-65535
     kelvin: int     # 1500-9000 (color temperature)
+    
+    # (field, min, max) checked by validate()
+    _RANGES = (
+        ('hue', 0, 65535),
+        ('saturation', 0, 65535),
+        ('brightness', 0, 65535),
+        ('kelvin', 1500, 9000)
+    )
 
     def validate(self) -> None:
         """Validate color parameters"""
-        if not 0 <= self.hue <= 65535:
-            raise ValueError(f"Invalid hue: {self.hue}")
-        if not 0 <= self.saturation <= 65535:
-            raise ValueError(f"Invalid saturation: {self.saturation}")
-        if not 0 <= self.brightness <= 65535:
-            raise ValueError(f"Invalid brightness: {self.brightness}")
-        if not 1500 <= self.kelvin <= 9000:
-            raise ValueError(f"Invalid kelvin: {self.kelvin}")
+        for field, lo, hi in self._RANGES:
+            value = getattr(self, field)
+            if not lo <= value <= hi:
+                raise ValueError(f"Invalid {field}: {value}")
 
 class LIFXController:
     """Controller for LIFX lights using aiolifx"""
     
     def __init__(self):
         self.lights: Dict[str, Light] = {}
-        self.loop = asyncio.get_event_loop()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
         self._discovery_complete = asyncio.Event()
         self._discovery = None
         self._discovery_task = None
-        self._light_lock = asyncio.Lock()
+        self._light_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # Per-light command locks
+        self._light_list: Optional[List[Light]] = None  # Cached snapshot of lights.values()
+        self._last_hsbk: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # Last color sent to each light
+        
+    def get_lights(self) -> List[Light]:
+        """Get the current lights as a list (cached until the set changes)"""
+        if self._light_list is None:
+            self._light_list = list(self.lights.values())
+        return self._light_list
+        
+    def _lights_changed(self) -> None:
+        """Invalidate the cached light list"""
+        self._light_list = None
+        
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the event loop the controller runs on"""
+        return self.loop or asyncio.get_running_loop()
+        
+    def _lock_for(self, light: Light) -> asyncio.Lock:
+        """Get the lock serializing commands to a single light"""
+        lock = self._light_locks.get(light)
+        if lock is None:
+            lock = self._light_locks[light] = asyncio.Lock()
+        return lock
         
     def _on_light_state(self, light: Light, *args):
         """Handle light state updates"""
-        mac = light.mac_addr
-        if isinstance(mac, bytes):
-            mac = mac.hex(':')
+        mac = _mac_of(light)
         if mac not in self.lights:
             self.lights[mac] = light
+            self._lights_changed()
             logger.info(f"Found light {mac} at {light.ip_addr}")
             
     async def discover_lights(self):
         """Discover LIFX lights on the network"""
         logger.info("Starting LIFX light discovery...")
+        self.loop = self._get_loop()
         
         # Get all network interfaces
         adapters = ifaddr.get_adapters()
@@ -122,8 +161,9 @@ class LIFXController:
                     logger.info(f"  {mac} at {light.ip_addr}")
             
             # Turn on all lights
-            for light in self.lights.values():
-                await self.set_power(light, True)
+            await asyncio.gather(
+                *(self.set_power(light, True) for light in self.lights.values())
+            )
                 
         except Exception as e:
             logger.error(f"Error during light discovery: {e}", exc_info=True)
@@ -134,12 +174,9 @@ class LIFXController:
     async def set_power(self, light: Light, power: bool):
         """Set light power state"""
         try:
-            async with self._light_lock:
+            async with self._lock_for(light):
                 light.set_power(65535 if power else 0, 0)
-                mac = light.mac_addr
-                if isinstance(mac, bytes):
-                    mac = mac.hex(':')
-                logger.info(f"Set power {'on' if power else 'off'} for light {mac}")
+                logger.info(f"Set power {'on' if power else 'off'} for light {_mac_of(light)}")
                 return True
         except Exception as e:
             logger.error(f"Error setting power: {e}")
@@ -155,19 +192,78 @@ class LIFXController:
         """
         try:
             color.validate()
-            async with self._light_lock:
-                light.set_color([color.hue, color.saturation, color.brightness, color.kelvin], duration)
+            hsbk = (color.hue, color.saturation, color.brightness, color.kelvin)
+            async with self._lock_for(light):
+                light.set_color(list(hsbk), duration=duration)
+                self._last_hsbk[light] = hsbk
                 return True
         except Exception as e:
             logger.error(f"Error setting color: {e}")
             return False
             
+    async def set_color_many(
+        self,
+        lights: List[Light],
+        color: Union[LightColor, List[LightColor]],
+        duration: int = 0
+    ):
+        """Set colors on several lights in one pass
+        
+        Lights whose last sent color already matches are skipped.
+        
+        Args:
+            lights: Lights to control
+            color: Color settings shared by all lights, or one per light
+            duration: Transition time in milliseconds
+        """
+        try:
+            last = self._last_hsbk
+            if isinstance(color, LightColor):
+                color.validate()
+                hsbk = (color.hue, color.saturation, color.brightness, color.kelvin)
+                for light in lights:
+                    if last.get(light) == hsbk:
+                        continue
+                    async with self._lock_for(light):
+                        light.set_color(list(hsbk), duration=duration)
+                        last[light] = hsbk
+            else:
+                for light, c in zip(lights, color):
+                    c.validate()
+                    hsbk = (c.hue, c.saturation, c.brightness, c.kelvin)
+                    if last.get(light) == hsbk:
+                        continue
+                    async with self._lock_for(light):
+                        light.set_color(list(hsbk), duration=duration)
+                        last[light] = hsbk
+            return True
+        except Exception as e:
+            logger.error(f"Error setting color: {e}")
+            return False
+            
+    async def set_color_all(self, color: LightColor, duration: int = 0):
+        """Set the same color on every known light
+        
+        Like set_color, this always sends, so it also resets lights changed
+        outside the controller (e.g. by waveforms).
+        
+        Args:
+            color: Color settings
+            duration: Transition time in milliseconds
+        """
+        results = await asyncio.gather(
+            *(self.set_color(light, color, duration) for light in self.get_lights())
+        )
+        return all(results)
+        
     async def cleanup(self):
         """Clean up resources"""
         # Turn off all lights
-        for light in self.lights.values():
-            await self.set_power(light, False)
+        await asyncio.gather(
+            *(self.set_power(light, False) for light in self.lights.values())
+        )
         self.lights = {}
+        self._lights_changed()
         
         # Clean up discovery
         if self._discovery:
@@ -176,19 +272,18 @@ class LIFXController:
             
     def register(self, light: Light):
         """Register a light with the controller"""
-        mac = light.mac_addr
-        if isinstance(mac, bytes):
-            mac = mac.hex(':')
+        mac = _mac_of(light)
+        light._pulse_mac_str = mac
         if mac not in self.lights:
             self.lights[mac] = light
+            self._lights_changed()
             light.get_state_handler = self._on_light_state
             logger.info(f"Registered light {mac} at {light.ip_addr}")
             
     def unregister(self, light: Light):
         """Unregister a light from the controller"""
-        mac = light.mac_addr
-        if isinstance(mac, bytes):
-            mac = mac.hex(':')
+        mac = _mac_of(light)
         if mac in self.lights:
             del self.lights[mac]
+            self._lights_changed()
             logger.info(f"Unregistered light {mac}")
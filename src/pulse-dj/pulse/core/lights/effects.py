@@ -8,15 +8,22 @@ Effects can be chained and transitioned smoothly.
 import asyncio
 import logging
 import math
-from typing import Dict, List, Optional, Set, Callable, Any
+from typing import Dict, List, Optional, Set, Callable, Any, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum, auto
 from contextlib import AsyncExitStack
 
+import numpy as np
+
 from .controller import LIFXController, LightColor, LightState
 
 logger = logging.getLogger(__name__)
 
+def _resolve(waiter: asyncio.Future) -> None:
+    """Complete a sleeping waiter if nothing else has"""
+    if not waiter.done():
+        waiter.set_result(None)
+
 class EffectType(Enum):
     """Types of light effects"""
     PULSE = auto()    # Pulse on beat
@@ -33,21 +40,42 @@ class EffectParams:
     intensity: float = 1.0      # Effect intensity (0-1)
     color: Optional[LightColor] = None    # Base color (optional)
     
+    # (field, min, max) checked by validate()
+    _RANGES = (
+        ('speed', 0, 10),
+        ('intensity', 0, 1)
+    )
+    
     def validate(self) -> None:
         """Validate parameters
         
         Raises:
             ValueError: If parameters are invalid
         """
-        if not 0 <= self.speed <= 10:
-            raise ValueError(f"Invalid speed: {self.speed}")
-        if not 0 <= self.intensity <= 1:
-            raise ValueError(f"Invalid intensity: {self.intensity}")
+        for field, lo, hi in self._RANGES:
+            value = getattr(self, field)
+            if not lo <= value <= hi:
+                raise ValueError(f"Invalid {field}: {value}")
+        if self.speed <= 0:
+            raise ValueError(f"Invalid speed: {self.speed}")  # Effects divide by speed
         if self.color:
             self.color.validate()
 
+@dataclass
+class EffectFrame:
+    """One rendered effect phase"""
+    colors: Union[LightColor, List[LightColor]]  # One color for all lights, or one per light
+    duration: int = 0                            # Transition time in milliseconds
+    hold: float = 0.0                            # Seconds until the next phase is due
+
 class Effect:
-    """Base class for light effects"""
+    """Base class for light effects
+    
+    Effects do not drive the lights themselves. The EffectManager's tick
+    loop calls render() for each phase and sends the returned frame.
+    """
+    
+    IDLE_INTERVAL = 0.1  # Seconds before rendering again when render() returns None
     
     def __init__(
         self,
@@ -64,31 +92,43 @@ class Effect:
         """
         self.type = effect_type
         self.controller = controller
-        self.params = params or EffectParams()
+        params = params or EffectParams()
+        params.validate()
+        self._params = params
         self._running = False
-        self._task: Optional[asyncio.Task] = None
         
-    async def start(self) -> None:
+    @property
+    def params(self) -> EffectParams:
+        """Effect parameters"""
+        return self._params
+        
+    @params.setter
+    def params(self, params: EffectParams) -> None:
+        params.validate()
+        self._params = params
+        self._recompute_cache()
+        
+    def _recompute_cache(self) -> None:
+        """Recompute values derived from params and timing (override in subclasses)"""
+        pass
+        
+    def start(self) -> None:
         """Start the effect"""
-        if self._running:
-            return
-            
         self._running = True
-        self._task = asyncio.create_task(self._run())
         
-    async def stop(self) -> None:
+    def stop(self) -> None:
         """Stop the effect"""
         self._running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-            self._task = None
             
-    async def _run(self) -> None:
-        """Run the effect (override in subclasses)"""
+    def render(self, phase: int) -> Optional[EffectFrame]:
+        """Render an effect phase (override in subclasses)
+        
+        Args:
+            phase: Phase number, counting from 0 when the effect starts
+            
+        Returns:
+            Frame to send, or None if there is nothing to show yet
+        """
         raise NotImplementedError
 
 class PulseEffect(Effect):
@@ -102,40 +142,36 @@ class PulseEffect(Effect):
         super().__init__(EffectType.PULSE, controller, params)
         self._last_beat = 0
         self._beat_interval = 0.5  # Default 120 BPM
+        self._recompute_cache()
         
-    async def _run(self) -> None:
-        """Run pulse effect"""
-        try:
-            while self._running:
-                # Calculate pulse brightness
-                max_brightness = 65535  # 100%
-                min_brightness = 16384  # 25%
-                
-                # Pulse brightness based on intensity
-                pulse = min_brightness + (max_brightness - min_brightness) * self.params.intensity
-                
-                # Set colors
-                async with self.controller._light_lock:
-                    for light in self.controller.lights.values():
-                        color = LightColor(0, 0, int(pulse), 3500)
-                        await self.controller.set_color(light, color)
-                        
-                # Wait for fade
-                await asyncio.sleep(self._beat_interval * 0.25)
-                
-                # Return to base brightness
-                async with self.controller._light_lock:
-                    for light in self.controller.lights.values():
-                        color = LightColor(0, 0, 32767, 3500)  # 50%
-                        await self.controller.set_color(light, color, int(self._beat_interval * 250))
-                        
-                # Wait for next beat
-                await asyncio.sleep(self._beat_interval * 0.75)
-                
-        except asyncio.CancelledError:
-            raise
-        except Exception as e:
-            logger.error(f"Error in pulse effect: {e}")
+    def _recompute_cache(self) -> None:
+        """Precompute pulse frames for the current intensity and tempo"""
+        # Calculate pulse brightness
+        max_brightness = 65535  # 100%
+        min_brightness = 16384  # 25%
+        
+        # Pulse brightness based on intensity
+        pulse = min_brightness + (max_brightness - min_brightness) * self.params.intensity
+        
+        self._pulse_color = LightColor(0, 0, int(pulse), 3500)
+        self._base_color = LightColor(0, 0, 32767, 3500)  # 50%
+        self._fade_sleep = self._beat_interval * 0.25
+        self._wait_sleep = self._beat_interval * 0.75
+        self._fade_ms = int(self._beat_interval * 250)
+        
+        # Pulse, then wait for fade
+        self._pulse_frame = EffectFrame(self._pulse_color, hold=self._fade_sleep)
+        
+        # Return to base brightness and wait for next beat
+        self._base_frame = EffectFrame(
+            self._base_color, duration=self._fade_ms, hold=self._wait_sleep
+        )
+        
+    def render(self, phase: int) -> Optional[EffectFrame]:
+        """Render pulse effect"""
+        if phase % 2 == 0:
+            return self._pulse_frame
+        return self._base_frame
             
     def update_timing(self, bpm: float) -> None:
         """Update beat timing
@@ -144,6 +180,11 @@ class PulseEffect(Effect):
             bpm: Beats per minute
         """
         self._beat_interval = 60.0 / bpm
+        self._recompute_cache()
+
+# Constant strobe colors, shared by every strobe frame
+_STROBE_ON = LightColor(0, 0, 65535, 3500)  # 100%
+_STROBE_OFF = LightColor(0, 0, 0, 3500)  # 0%
 
 class StrobeEffect(Effect):
     """Rapid on/off effect"""
@@ -154,35 +195,22 @@ class StrobeEffect(Effect):
         params: Optional[EffectParams] = None
     ):
         super().__init__(EffectType.STROBE, controller, params)
+        self._recompute_cache()
         
-    async def _run(self) -> None:
-        """Run strobe effect"""
-        try:
-            while self._running:
-                # Calculate timing
-                period = 0.1 / self.params.speed  # Base 0.1s period
-                on_time = period * 0.5  # 50% duty cycle
-                
-                # Strobe on
-                async with self.controller._light_lock:
-                    for light in self.controller.lights.values():
-                        color = LightColor(0, 0, 65535, 3500)  # 100%
-                        await self.controller.set_color(light, color)
-                        
-                await asyncio.sleep(on_time)
-                
-                # Strobe off
-                async with self.controller._light_lock:
-                    for light in self.controller.lights.values():
-                        color = LightColor(0, 0, 0, 3500)  # 0%
-                        await self.controller.set_color(light, color)
-                        
-                await asyncio.sleep(period - on_time)
-                
-        except asyncio.CancelledError:
-            raise
-        except Exception as e:
-            logger.error(f"Error in strobe effect: {e}")
+    def _recompute_cache(self) -> None:
+        """Precompute strobe frames for the current speed"""
+        # Calculate timing
+        self._period = 0.1 / self.params.speed  # Base 0.1s period
+        self._on_time = self._period * 0.5  # 50% duty cycle
+        
+        self._on_frame = EffectFrame(_STROBE_ON, hold=self._on_time)
+        self._off_frame = EffectFrame(_STROBE_OFF, hold=self._period - self._on_time)
+        
+    def render(self, phase: int) -> Optional[EffectFrame]:
+        """Render strobe effect"""
+        if phase % 2 == 0:
+            return self._on_frame
+        return self._off_frame
 
 class RainbowEffect(Effect):
     """Color cycle effect"""
@@ -193,35 +221,24 @@ class RainbowEffect(Effect):
         params: Optional[EffectParams] = None
     ):
         super().__init__(EffectType.RAINBOW, controller, params)
+        self._recompute_cache()
         
-    async def _run(self) -> None:
-        """Run rainbow effect"""
-        try:
-            hue = 0
-            while self._running:
-                # Calculate color
-                color = LightColor(
-                    hue=hue,
-                    saturation=65535,  # 100%
-                    brightness=int(32767 * self.params.intensity),  # 50% * intensity
-                    kelvin=3500
-                )
-                
-                # Update lights
-                async with self.controller._light_lock:
-                    for light in self.controller.lights.values():
-                        await self.controller.set_color(light, color, 100)
-                        
-                # Update hue
-                hue = (hue + 1000) % 65535
-                
-                # Wait based on speed
-                await asyncio.sleep(0.05 / self.params.speed)
-                
-        except asyncio.CancelledError:
-            raise
-        except Exception as e:
-            logger.error(f"Error in rainbow effect: {e}")
+    def _recompute_cache(self) -> None:
+        """Precompute rainbow brightness and step time"""
+        self._saturation = 65535  # 100%
+        self._brightness = int(32767 * self.params.intensity)  # 50% * intensity
+        self._sleep = 0.05 / self.params.speed  # Wait based on speed
+        
+    def render(self, phase: int) -> Optional[EffectFrame]:
+        """Render rainbow effect"""
+        # Calculate color, advancing the hue each phase
+        color = LightColor(
+            hue=(phase * 1000) % 65535,
+            saturation=self._saturation,
+            brightness=self._brightness,
+            kelvin=3500
+        )
+        return EffectFrame(color, duration=100, hold=self._sleep)
 
 class ChaseEffect(Effect):
     """Moving light pattern effect"""
@@ -232,47 +249,69 @@ class ChaseEffect(Effect):
         params: Optional[EffectParams] = None
     ):
         super().__init__(EffectType.CHASE, controller, params)
+        self._idx = np.arange(0, dtype=np.int32)
+        self._inv_n = 0.0
+        self._recompute_cache()
         
-    async def _run(self) -> None:
-        """Run chase effect"""
-        try:
-            lights = list(self.controller.lights.values())
-            if not lights:
-                return
-                
-            position = 0
-            while self._running:
-                # Calculate colors
-                for i, light in enumerate(lights):
-                    # Calculate distance from chase position
-                    dist = abs(i - position)
-                    intensity = max(0, 1 - (dist / len(lights)))
-                    
-                    # Set color based on intensity
-                    color = LightColor(
-                        hue=0,
-                        saturation=0,
-                        brightness=int(65535 * intensity * self.params.intensity),
-                        kelvin=3500
-                    )
-                    
-                    async with self.controller._light_lock:
-                        await self.controller.set_color(light, color, 50)
-                        
-                # Update position
-                position = (position + 1) % len(lights)
-                
-                # Wait based on speed
-                await asyncio.sleep(0.2 / self.params.speed)
-                
-        except asyncio.CancelledError:
-            raise
-        except Exception as e:
-            logger.error(f"Error in chase effect: {e}")
+    def _recompute_cache(self) -> None:
+        """Precompute chase step time"""
+        self._sleep = 0.2 / self.params.speed  # Wait based on speed
+        
+    def _update_indices(self, n: int) -> None:
+        """Rebuild light index cache when the number of lights changes"""
+        self._idx = np.arange(n, dtype=np.int32)
+        self._inv_n = 1.0 / n
+        
+    def render(self, phase: int) -> Optional[EffectFrame]:
+        """Render chase effect"""
+        lights = self.controller.get_lights()
+        if not lights:
+            return None
+            
+        if len(lights) != self._idx.size:
+            self._update_indices(len(lights))
+            
+        # Chase position moves one light per phase
+        position = phase % len(lights)
+        
+        # Intensity falls off with distance from chase position
+        intensities = np.maximum(0.0, 1.0 - np.abs(self._idx - position) * self._inv_n)
+        brightness = (intensities * (65535 * self.params.intensity)).astype(np.uint16)
+        
+        colors = [
+            LightColor(hue=0, saturation=0, brightness=b, kelvin=3500)
+            for b in brightness.tolist()
+        ]
+        return EffectFrame(colors, duration=50, hold=self._sleep)
+
+def _features_to_hsb(
+    bass: float,
+    mids: float,
+    highs: float,
+    intensity: float
+) -> Tuple[int, int, int]:
+    """Map audio band levels to hue, saturation and brightness
+    
+    Args:
+        bass: Normalized bass level (0-1)
+        mids: Normalized mids level (0-1)
+        highs: Normalized highs level (0-1)
+        intensity: Effect intensity (0-1)
+        
+    Returns:
+        Hue (0-21845, red-yellow), saturation and brightness (0-65535)
+    """
+    return (
+        int(bass * 21845),
+        int(mids * 65535),
+        int(highs * 65535 * intensity)
+    )
 
 class MusicEffect(Effect):
     """Audio reactive color effect"""
     
+    IDLE_INTERVAL = math.inf  # Woken by EffectManager.update_features instead
+    
     def __init__(
         self,
         controller: LIFXController,
@@ -281,37 +320,19 @@ class MusicEffect(Effect):
         super().__init__(EffectType.MUSIC, controller, params)
         self._features: Dict[str, float] = {}
         
-    async def _run(self) -> None:
-        """Run music effect"""
-        try:
-            while self._running:
-                if not self._features:
-                    await asyncio.sleep(0.1)
-                    continue
-                    
-                # Calculate colors based on audio features
-                bass = self._features.get('bass', 0)
-                mids = self._features.get('mids', 0)
-                highs = self._features.get('highs', 0)
-                
-                # Map frequencies to colors
-                hue = int(bass * 21845)  # 0-21845 (red-yellow)
-                saturation = int(mids * 65535)  # 0-65535
-                brightness = int(highs * 65535 * self.params.intensity)
-                
-                color = LightColor(hue, saturation, brightness, 3500)
-                
-                # Update lights
-                async with self.controller._light_lock:
-                    for light in self.controller.lights.values():
-                        await self.controller.set_color(light, color)
-                        
-                await asyncio.sleep(0.05)
-                
-        except asyncio.CancelledError:
-            raise
-        except Exception as e:
-            logger.error(f"Error in music effect: {e}")
+    def render(self, phase: int) -> Optional[EffectFrame]:
+        """Render music effect"""
+        if not self._features:
+            return None
+            
+        # Calculate colors based on audio features
+        hue, saturation, brightness = _features_to_hsb(
+            self._features.get('bass', 0),
+            self._features.get('mids', 0),
+            self._features.get('highs', 0),
+            self.params.intensity
+        )
+        return EffectFrame(LightColor(hue, saturation, brightness, 3500), hold=0.05)
             
     def update_features(self, features: Dict[str, float]) -> None:
         """Update audio features
@@ -321,8 +342,26 @@ class MusicEffect(Effect):
         """
         self._features = features
 
+# Effect implementation for each effect type, indexed by EffectType.value - 1
+# (auto() numbers the members 1..N in order; None where not implemented)
+_EFFECT_CLASSES: Tuple[Optional[type], ...] = tuple(
+    {
+        EffectType.PULSE: PulseEffect,
+        EffectType.STROBE: StrobeEffect,
+        EffectType.RAINBOW: RainbowEffect,
+        EffectType.CHASE: ChaseEffect,
+        EffectType.MUSIC: MusicEffect
+    }.get(effect_type)
+    for effect_type in EffectType
+)
+
 class EffectManager:
-    """Manages light effects"""
+    """Manages light effects
+    
+    A single persistent tick task renders the active effect and sleeps
+    until the next phase is due, instead of each effect running its own
+    task.
+    """
     
     def __init__(self, controller: LIFXController):
         """Initialize manager
@@ -331,38 +370,137 @@ class EffectManager:
             controller: Light controller
         """
         self.controller = controller
-        self._effects: Dict[EffectType, Effect] = {}
+        self._effects: List[Optional[Effect]] = [None] * len(EffectType)  # Indexed by EffectType.value - 1
         self._active_effect: Optional[Effect] = None
         self._exit_stack = AsyncExitStack()
+        self._tick_task: Optional[asyncio.Task] = None
+        self._waiter: Optional[asyncio.Future] = None
+        self._starts = 0  # Bumped on every start_effect so restarts reset the phase
+        self._idle = False  # Active effect had nothing to render on its last phase
+        self._wake_pending = False  # Woken while not sleeping (e.g. mid-send)
+        
+    def _wake(self) -> None:
+        """Wake the tick loop before its next deadline"""
+        if self._waiter is None:
+            self._wake_pending = True  # Picked up by the next _sleep_until
+        elif not self._waiter.done():
+            self._waiter.set_result(None)
+            
+    async def _sleep_until(self, loop: asyncio.AbstractEventLoop, deadline: float) -> None:
+        """Sleep until deadline (loop time) or until woken by _wake()"""
+        if self._wake_pending:
+            self._wake_pending = False
+            return
+        self._waiter = waiter = loop.create_future()
+        handle = loop.call_at(deadline, _resolve, waiter)
+        try:
+            await waiter
+        finally:
+            handle.cancel()
+            self._waiter = None
+            
+    async def _send_frame(self, frame: EffectFrame) -> None:
+        """Send a rendered frame to the lights
         
-    async def start_effect(
+        get_lights() returns a snapshot that is replaced, never mutated, when
+        lights come and go, so no lock is needed around the send; per-light
+        ordering is kept by the controller's per-light locks.
+        """
+        lights = self.controller.get_lights()
+        await self.controller.set_color_many(lights, frame.colors, frame.duration)
+                    
+    async def _tick_loop(self) -> None:
+        """Render the active effect, phase by phase, on absolute deadlines"""
+        loop = asyncio.get_running_loop()
+        effect: Optional[Effect] = None
+        starts = -1
+        phase = 0
+        deadline = loop.time()
+        
+        while True:
+            # Restart phase timing when an effect is (re)started or stopped
+            if self._active_effect is not effect or self._starts != starts:
+                effect = self._active_effect
+                starts = self._starts
+                phase = 0
+                deadline = loop.time()
+                
+            if effect is None or not effect._running:
+                await self._sleep_until(loop, math.inf)
+                continue
+                
+            try:
+                frame = effect.render(phase)
+                if frame is None:
+                    self._idle = True
+                    deadline = loop.time() + effect.IDLE_INTERVAL
+                else:
+                    if self._idle or not math.isfinite(deadline):
+                        deadline = loop.time()  # Resume timing after an idle wait
+                    self._idle = False
+                    await self._send_frame(frame)
+                    phase += 1
+                    deadline += frame.hold
+            except Exception as e:
+                logger.error("Error in %s effect: %s", effect.type.name.lower(), e)
+                effect.stop()
+                if self._active_effect is effect:
+                    self._active_effect = None
+                continue
+                
+            # Skip ahead rather than bursting to catch up when behind
+            now = loop.time()
+            if deadline < now:
+                deadline = now
+            await self._sleep_until(loop, deadline)
+            
+    def start_effect(
         self,
         effect_type: EffectType,
         params: Optional[EffectParams] = None
     ) -> None:
         """Start an effect
         
+        Swaps the active effect in place; the tick loop picks it up on its
+        next wake. Must be called from the event loop thread.
+        
         Args:
             effect_type: Type of effect to start
             params: Optional effect parameters
+            
+        Raises:
+            ValueError: If params are invalid (the current effect keeps running)
         """
+        if params:
+            params.validate()
+            
         # Stop current effect
         if self._active_effect:
-            await self._active_effect.stop()
+            self._active_effect.stop()
             
         # Create effect if needed
-        if effect_type not in self._effects:
+        effect = self._effects[effect_type.value - 1]
+        if effect is None:
             effect = self._create_effect(effect_type, params)
             if not effect:
+                # The previous effect is stopped; don't leave it rendering
+                self._active_effect = None
+                self._wake()
                 return
-            self._effects[effect_type] = effect
+            self._effects[effect_type.value - 1] = effect
+        elif params:
+            effect.params = params
             
         # Start new effect
-        effect = self._effects[effect_type]
-        if params:
-            effect.params = params
-        await effect.start()
+        effect.start()
         self._active_effect = effect
+        self._starts += 1
+        
+        # Start the tick loop once, or wake it for the new effect
+        if self._tick_task is None:
+            self._tick_task = asyncio.create_task(self._tick_loop())
+        else:
+            self._wake()
         
     def _create_effect(
         self,
@@ -378,25 +516,18 @@ class EffectManager:
         Returns:
             Created effect or None if invalid type
         """
-        if effect_type == EffectType.PULSE:
-            return PulseEffect(self.controller, params)
-        elif effect_type == EffectType.STROBE:
-            return StrobeEffect(self.controller, params)
-        elif effect_type == EffectType.RAINBOW:
-            return RainbowEffect(self.controller, params)
-        elif effect_type == EffectType.CHASE:
-            return ChaseEffect(self.controller, params)
-        elif effect_type == EffectType.MUSIC:
-            return MusicEffect(self.controller, params)
-        else:
-            logger.error(f"Unknown effect type: {effect_type}")
+        cls = _EFFECT_CLASSES[effect_type.value - 1]
+        if cls is None:
+            logger.error("Unknown effect type: %s", effect_type)
             return None
+        return cls(self.controller, params)
             
-    async def stop_effect(self) -> None:
+    def stop_effect(self) -> None:
         """Stop the current effect"""
         if self._active_effect:
-            await self._active_effect.stop()
+            self._active_effect.stop()
             self._active_effect = None
+            self._wake()
             
     def update_timing(self, bpm: float) -> None:
         """Update effect timing
@@ -415,14 +546,27 @@ class EffectManager:
         """
         if isinstance(self._active_effect, MusicEffect):
             self._active_effect.update_features(features)
+            if self._idle:
+                self._wake()
             
     async def cleanup(self) -> None:
         """Clean up resources"""
-        # Stop all effects
-        for effect in self._effects.values():
-            await effect.stop()
+        # Stop tick loop
+        if self._tick_task:
+            self._tick_task.cancel()
+            try:
+                await self._tick_task
+            except asyncio.CancelledError:
+                pass
+            self._tick_task = None
+            self._wake_pending = False
             
-        self._effects.clear()
+        # Stop all effects
+        for effect in self._effects:
+            if effect is not None:
+                effect.stop()
+                
+        self._effects = [None] * len(EffectType)
         self._active_effect = None
         
         # Clean up resources
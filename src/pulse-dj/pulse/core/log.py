@@ -0,0 +1,34 @@
+"""Logging helpers"""
+
+import logging
+from collections import Counter
+
+class CallbackErrorLogger:
+    """Logs callback errors, sampling repeats at powers of two
+    
+    Only the 1st, 2nd, 4th, 8th, ... error of each callback is logged, so
+    an error that recurs at message rate cannot flood the log.
+    """
+    
+    def __init__(self, logger: logging.Logger):
+        """Initialize error logger
+        
+        Args:
+            logger: Logger that receives the sampled errors
+        """
+        self._logger = logger
+        self._counts: Counter = Counter()  # Errors seen by callback name
+        
+    def __call__(self, name: str, e: Exception) -> None:
+        """Log a callback error if it is sampled
+        
+        Must be called from the except block so the traceback is attached.
+        
+        Args:
+            name: Callback name
+            e: Exception raised by the callback
+        """
+        count = self._counts[name] + 1
+        self._counts[name] = count
+        if count & (count - 1) == 0:
+            self._logger.exception("Error in %s callback (%d so far): %s", name, count, e)
@@ -0,0 +1,26 @@
+"""Event loop helpers
+
+Shared by the entry-point scripts; kept free of audio, light and OS2L
+imports so any of them can use it.
+"""
+
+import asyncio
+import sys
+
+def use_fast_event_loop() -> bool:
+    """Install uvloop's event loop policy when it is available
+    
+    Must be called before the event loop is created (before asyncio.run).
+    uvloop is not available on Windows, where this does nothing.
+    
+    Returns:
+        True if uvloop was installed
+    """
+    if sys.platform == 'win32':
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
@@ -0,0 +1,53 @@
+# cython: language_level=3
+"""Compiled OS2L message scanner for OS2LProtocol"""
+
+cimport cython
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def scan_messages(bytearray buf, Py_ssize_t pos, Py_ssize_t depth, bint in_string):
+    """Scan buf from pos for complete top-level JSON objects
+
+    Args:
+        buf: Receive buffer, starting at the current message
+        pos: Offset scanned so far
+        depth: Object nesting depth at pos
+        in_string: Whether pos is inside a JSON string
+
+    Returns:
+        Tuple of (messages, start, pos, depth, in_string) where start is
+        the offset of the first byte to keep
+    """
+    cdef const unsigned char[::1] view = buf
+    cdef Py_ssize_t n = view.shape[0]
+    cdef Py_ssize_t start = 0
+    cdef unsigned char c
+    cdef list messages = []
+
+    while pos < n:
+        c = view[pos]
+        if in_string:
+            if c == b'\\':
+                if pos + 1 >= n:
+                    break  # Escape split across reads, rescan it
+                pos += 1
+            elif c == b'"':
+                in_string = False
+        elif depth == 0:
+            if c == b'{':
+                start = pos
+                depth = 1
+        elif c == b'"':
+            in_string = True
+        elif c == b'{':
+            depth += 1
+        elif c == b'}':
+            depth -= 1
+            if depth == 0:
+                messages.append(buf[start:pos + 1].decode('utf-8'))
+                start = pos + 1
+        pos += 1
+
+    if depth == 0:
+        start = pos  # Nothing to keep outside an object
+    return messages, start, pos, depth, in_string
@@ -7,7 +7,26 @@ See: https://www.virtualdj.com/wiki/os2l.html
 import json
 import logging
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
+
+try:
+    # orjson is optional; its JSONDecodeError subclasses json.JSONDecodeError
+    import orjson
+    _loads = orjson.loads
+    
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+        
+    def _dumps_frame(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    _loads = json.loads
+    
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'))  # Compact, like orjson
+        
+    def _dumps_frame(obj: Any) -> bytes:
+        return (_dumps(obj) + '\n').encode('utf-8')
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +41,8 @@ class ValidationError(ProtocolError):
 @dataclass
 class OS2LMessage:
     """Base class for OS2L messages"""
+    __slots__ = ('evt',)
+    
     evt: str  # Event type
     
     def validate(self):
@@ -35,7 +56,11 @@ class OS2LMessage:
         
     def to_json(self) -> str:
         """Convert message to JSON string"""
-        return json.dumps(self.to_dict())
+        return _dumps(self.to_dict())
+        
+    def to_frame(self) -> bytes:
+        """Convert message to a newline-terminated UTF-8 frame for the wire"""
+        return _dumps_frame(self.to_dict())
 
 @dataclass
 class BeatMessage(OS2LMessage):
@@ -48,6 +73,14 @@ class BeatMessage(OS2LMessage):
     - strength: Beat strength (0-100)
     - change: Whether BPM changed
     """
+    __slots__ = ('pos', 'bpm', 'strength', 'change')
+    
+    # (field, label, min, max) checked by validate()
+    _RANGES = (
+        ('bpm', 'BPM', 30, 300),
+        ('strength', 'Strength', 0, 100)
+    )
+    
     pos: int
     bpm: float
     strength: float
@@ -65,10 +98,14 @@ class BeatMessage(OS2LMessage):
         super().validate()
         if self.evt != "beat":
             raise ValidationError(f"Invalid event type for beat message: {self.evt}")
-        if not (30 <= self.bpm <= 300):
-            raise ValidationError(f"BPM must be between 30 and 300, got {self.bpm}")
-        if not (0 <= self.strength <= 100):
-            raise ValidationError(f"Strength must be between 0 and 100, got {self.strength}")
+        self._check_ranges()
+        
+    def _check_ranges(self):
+        """Check the numeric fields against _RANGES"""
+        for field, label, lo, hi in self._RANGES:
+            value = getattr(self, field)
+            if not (lo <= value <= hi):
+                raise ValidationError(f"{label} must be between {lo} and {hi}, got {value}")
             
     def to_dict(self) -> Dict[str, Any]:
         """Convert beat message to dictionary"""
@@ -90,9 +127,11 @@ class ButtonMessage(OS2LMessage):
     - page: Optional page name
     - state: Button pressed/released ("on"/"off")
     """
+    __slots__ = ('name', 'state', 'page')
+    
     name: str
     state: str
-    page: Optional[str] = None
+    page: Optional[str]  # Defaults to None in __init__
     
     def __init__(self, name: str, state: str, page: Optional[str] = None):
         super().__init__(evt="btn")
@@ -130,6 +169,8 @@ class CommandMessage(OS2LMessage):
     - id: Command ID (1-4)
     - param: Parameter value (0-100%)
     """
+    __slots__ = ('id', 'param')
+    
     id: int
     param: float
     
@@ -166,9 +207,11 @@ class FeedbackMessage(OS2LMessage):
     - page: Optional page name
     - state: Button state ("on"/"off")
     """
+    __slots__ = ('name', 'state', 'page')
+    
     name: str
     state: str
-    page: Optional[str] = None
+    page: Optional[str]  # Defaults to None in __init__
     
     def __init__(self, name: str, state: bool, page: Optional[str] = None):
         super().__init__(evt="feedback")
@@ -197,11 +240,76 @@ class FeedbackMessage(OS2LMessage):
             msg['page'] = self.page
         return msg
 
-def parse_message(data: str) -> Optional[OS2LMessage]:
+@dataclass(frozen=True)
+class BeatInfo:
+    """Beat data passed to OS2LServer beat callbacks"""
+    __slots__ = ('bpm', 'position', 'strength', 'change')
+    
+    bpm: float       # Current BPM
+    position: int    # Beat position
+    strength: float  # Beat strength (0-100)
+    change: bool     # Whether BPM changed
+
+@dataclass(frozen=True)
+class ButtonInfo:
+    """Button data passed to OS2LServer button callbacks"""
+    __slots__ = ('name', 'page', 'state')
+    
+    name: str             # Button name/ID
+    page: Optional[str]   # Optional page name
+    state: bool           # True when pressed ("on")
+
+@dataclass(frozen=True)
+class CommandInfo:
+    """Command data passed to OS2LServer command callbacks"""
+    __slots__ = ('id', 'param')
+    
+    id: int       # Command ID (1-4)
+    param: float  # Parameter value (0-1)
+
+def _parse_beat(msg: Dict[str, Any]) -> BeatMessage:
+    """Build and validate a beat message from decoded JSON"""
+    message = BeatMessage(
+        pos=int(msg['pos']),
+        bpm=float(msg['bpm']),
+        strength=float(msg.get('strength', 100.0)),
+        change=bool(msg.get('change', False))
+    )
+    message._check_ranges()  # evt is known to be "beat" here
+    return message
+
+def _parse_button(msg: Dict[str, Any]) -> ButtonMessage:
+    """Build and validate a button message from decoded JSON"""
+    name = str(msg['name'])
+    state = msg['state']  # Only the "on"/"off" strings pass validation
+    if not name:
+        raise ValidationError("Button name cannot be empty")
+    if state not in ("on", "off"):
+        raise ValidationError(f"Invalid button state: {state}")
+    return ButtonMessage(name=name, state=state, page=msg.get('page'))
+
+def _parse_command(msg: Dict[str, Any]) -> CommandMessage:
+    """Build and validate a command message from decoded JSON"""
+    id = int(msg['id'])
+    param = float(msg['param'])
+    if not (1 <= id <= 4):
+        raise ValidationError(f"Command ID must be between 1 and 4, got {id}")
+    if not (0 <= param <= 100):
+        raise ValidationError(f"Parameter must be between 0 and 100%, got {param}")
+    return CommandMessage(id=id, param=param)
+
+# Message parsers by event type
+_DISPATCH = {
+    'beat': _parse_beat,
+    'btn': _parse_button,
+    'cmd': _parse_command
+}
+
+def parse_message(data: Union[str, bytes]) -> Optional[OS2LMessage]:
     """Parse OS2L message from JSON string
     
     Args:
-        data: JSON string from VirtualDJ
+        data: JSON string or bytes from VirtualDJ
         
     Returns:
         Parsed OS2L message or None if parsing fails
@@ -211,44 +319,18 @@ def parse_message(data: str) -> Optional[OS2LMessage]:
         ValueError: If message type is unknown
     """
     try:
-        msg = json.loads(data)
-        logger.debug(f"Parsing message: {msg}")
+        msg = _loads(data)
+        logger.debug("Parsing message: %s", msg)
         
         if 'evt' not in msg:
             raise ValueError("Missing 'evt' field in message")
             
         evt = msg['evt']
-        
-        # Parse beat message
-        if evt == 'beat':
-            message = BeatMessage(
-                pos=int(msg['pos']),
-                bpm=float(msg['bpm']),
-                strength=float(msg.get('strength', 100.0)),
-                change=bool(msg.get('change', False))
-            )
-            
-        # Parse button message
-        elif evt == 'btn':
-            message = ButtonMessage(
-                name=str(msg['name']),
-                state=str(msg['state']),
-                page=msg.get('page')
-            )
-            
-        # Parse command message
-        elif evt == 'cmd':
-            message = CommandMessage(
-                id=int(msg['id']),
-                param=float(msg['param'])
-            )
-            
-        else:
+        parser = _DISPATCH.get(evt)
+        if parser is None:
             raise ValueError(f"Unknown event type: {evt}")
             
-        # Validate message
-        message.validate()
-        return message
+        return parser(msg)
         
     except json.JSONDecodeError as e:
         logger.warning(f"Invalid JSON: {e}")
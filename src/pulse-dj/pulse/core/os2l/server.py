@@ -5,16 +5,20 @@ It acts as a DMX software that VirtualDJ can connect to.
 """
 
 import asyncio
+import functools
 import json
 import logging
-import traceback
+import re
 import socket
-from typing import Dict, Any, Optional, Callable, Set
+from typing import Dict, Any, List, Optional, Callable
 from zeroconf.asyncio import AsyncZeroconf
 from zeroconf import ServiceInfo
 from .protocol import (
+    BeatInfo,
     BeatMessage,
+    ButtonInfo,
     ButtonMessage,
+    CommandInfo,
     CommandMessage,
     FeedbackMessage,
     parse_message,
@@ -24,26 +28,139 @@ from .protocol import (
 
 logger = logging.getLogger(__name__)
 
+# Characters the message scanner stops at, outside and inside JSON strings
+_STRUCTURE = re.compile(rb'[{}"]')
+_STRING = re.compile(rb'["\\]')
+
+def _py_scan_messages(buf: bytearray, pos: int, depth: int, in_string: bool):
+    """Scan buf from pos for complete top-level JSON objects
+    
+    Tracks nesting depth and string state so nested objects and braces
+    inside strings are handled. Structural characters are ASCII, so the
+    raw UTF-8 can be scanned and only complete messages are decoded.
+    
+    Args:
+        buf: Receive buffer, starting at the current message
+        pos: Offset scanned so far
+        depth: Object nesting depth at pos
+        in_string: Whether pos is inside a JSON string
+        
+    Returns:
+        Tuple of (messages, start, pos, depth, in_string) where start is
+        the offset of the first byte to keep
+    """
+    messages = []
+    n = len(buf)
+    start = 0  # Buffer always begins at the current message
+    
+    with memoryview(buf) as view:
+        while pos < n:
+            if in_string:
+                m = _STRING.search(buf, pos)
+                if m is None:
+                    pos = n
+                elif m.group() == b'"':
+                    in_string = False
+                    pos = m.end()
+                elif m.end() < n:
+                    pos = m.end() + 1  # Skip escaped character
+                else:
+                    pos = m.start()  # Escape split across reads, rescan it
+                    break
+            elif depth == 0:
+                start = buf.find(b'{', pos)
+                if start < 0:
+                    start = pos = n
+                else:
+                    depth = 1
+                    pos = start + 1
+            else:
+                m = _STRUCTURE.search(buf, pos)
+                if m is None:
+                    pos = n
+                    break
+                pos = m.end()
+                c = m.group()
+                if c == b'"':
+                    in_string = True
+                elif c == b'{':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        messages.append(str(view[start:pos], 'utf-8'))
+                        start = pos
+                        
+    return messages, start, pos, depth, in_string
+
+try:
+    # Optional compiled scanner (built by setup.py when Cython is available)
+    from ._scanner import scan_messages as _scan_messages
+except ImportError:
+    _scan_messages = _py_scan_messages
+
+@functools.lru_cache(maxsize=512)
+def _encode_feedback(name: str, page: Optional[str], state: bool) -> bytes:
+    """Encode a newline-terminated feedback frame once per button state"""
+    return FeedbackMessage(name=name, page=page, state=state).to_frame()
+
+@functools.lru_cache(maxsize=8)
+def _build_service_info(host: str, port: int) -> ServiceInfo:
+    """Build the OS2L DNS-SD service info once per address"""
+    # Convert IP address to proper format
+    addr_bytes = socket.inet_pton(socket.AF_INET, host)
+    
+    return ServiceInfo(
+        "_os2l._tcp.local.",
+        "LIFX Light Sync._os2l._tcp.local.",
+        addresses=[addr_bytes],
+        port=port,
+        properties={},
+        server="lifx-sync.local."
+    )
+
 class OS2LProtocol(asyncio.Protocol):
     """OS2L TCP Protocol Handler"""
     
+    MAX_BUFFER = 64 * 1024  # Largest incomplete message kept before disconnecting
+    
     def __init__(self, server: 'OS2LServer'):
         self.server = server
         self.transport = None
-        self.buffer = ""
+        self.buffer = bytearray()  # Undecoded bytes of the pending message
         self.peername = None
+        self._pending: List[bytes] = []  # Frames waiting for the next flush
+        self._loop = None
+        self._reset_scan()
+        
+    def _reset_scan(self):
+        """Reset the message scanner state"""
+        self._scan = 0  # Buffer offset scanned so far
+        self._depth = 0  # Object nesting depth at _scan
+        self._in_string = False  # Whether _scan is inside a JSON string
         
     def connection_made(self, transport: asyncio.Transport):
         """Handle new connection"""
         self.transport = transport
         self.peername = transport.get_extra_info('peername')
+        self._loop = asyncio.get_running_loop()
+        self.server.configure_transport(transport)
         logger.info(f"Client connected from {self.peername}")
-        self.server.connections.add(self)
+        self.server._add_connection(self)
         
     def connection_lost(self, exc):
         """Handle connection lost"""
         logger.info(f"Client disconnected from {self.peername}")
-        self.server.connections.remove(self)
+        self.server._remove_connection(self)
+        
+        # Reset and hand back to the server for the next connection. Only
+        # the instance is reused: clear() also frees the buffer's storage.
+        self.transport = None
+        self.peername = None
+        self.buffer.clear()
+        self._pending.clear()
+        self._reset_scan()
+        self.server._pool.append(self)
         
     def data_received(self, data: bytes):
         """Handle received data
@@ -53,42 +170,51 @@ class OS2LProtocol(asyncio.Protocol):
         """
         try:
             # Log raw data for debugging
-            logger.debug(f"Received data from {self.peername}: {data}")
+            logger.debug("Received data from %s: %r", self.peername, data)
             
-            # Add to buffer
-            self.buffer += data.decode('utf-8')
+            # Add to buffer; only complete messages are decoded
+            self.buffer.extend(data)
             
             # Process complete messages
-            while True:
-                # Find start of next message
-                try:
-                    start = self.buffer.index('{')
-                except ValueError:
-                    # No start of message found
-                    self.buffer = ""
-                    break
-                    
-                # Find end of message
-                try:
-                    end = self.buffer.index('}', start) + 1
-                except ValueError:
-                    # Incomplete message
-                    self.buffer = self.buffer[start:]
-                    break
-                    
-                # Extract and parse message
-                message = self.buffer[start:end]
-                self.buffer = self.buffer[end:]
+            for message in self._split_messages():
+                logger.debug("Processing message: %s", message)
+                self.server.handle_message(self, message)
                 
-                logger.debug(f"Processing message: {message}")
-                
-                asyncio.create_task(
-                    self.server.handle_message(self, message)
+            # Drop clients that never finish a message
+            if len(self.buffer) > self.MAX_BUFFER:
+                logger.warning(
+                    f"Closing connection from {self.peername}: "
+                    f"incomplete message exceeds {self.MAX_BUFFER} bytes"
                 )
-                
+                self.buffer.clear()
+                self._reset_scan()
+                if self.transport:
+                    self.transport.close()
+                    
         except Exception as e:
             logger.error(f"Error handling data: {e}")
-            self.buffer = ""  # Clear buffer on error
+            self.buffer.clear()  # Clear buffer on error
+            self._reset_scan()
+            
+    def _split_messages(self) -> List[str]:
+        """Extract complete top-level JSON objects from the buffer
+        
+        Resumes where the previous call stopped so each byte is scanned
+        once. Bytes between messages are dropped; the buffer keeps only
+        the incomplete message, if any.
+        
+        Returns:
+            Complete message strings, in order
+        """
+        buf = self.buffer
+        messages, start, pos, self._depth, self._in_string = _scan_messages(
+            buf, self._scan, self._depth, self._in_string
+        )
+        
+        # Compact in place
+        del buf[:start]
+        self._scan = pos - start
+        return messages
             
     def send_message(self, message: str):
         """Send message to client
@@ -96,12 +222,32 @@ class OS2LProtocol(asyncio.Protocol):
         Args:
             message: Message string to send
         """
+        logger.debug("Sending message to %s: %s", self.peername, message)
+        self.send_bytes(f"{message}\n".encode('utf-8'))
+        
+    def send_bytes(self, payload: bytes):
+        """Send an already encoded, newline-terminated frame to client
+        
+        Frames sent during one event loop iteration are written together
+        on the next one, so bursts reach the socket as a single write.
+        
+        Args:
+            payload: Encoded frame to send
+        """
+        if not self.transport or self.transport.is_closing():
+            return
+        if not self._pending:
+            self._loop.call_soon(self._flush)
+        self._pending.append(payload)
+        
+    def _flush(self):
+        """Write all pending frames to the transport"""
         try:
-            if self.transport and not self.transport.is_closing():
-                logger.debug(f"Sending message to {self.peername}: {message}")
-                self.transport.write(f"{message}\n".encode('utf-8'))
+            if self._pending and self.transport and not self.transport.is_closing():
+                self.transport.writelines(self._pending)
         except Exception as e:
             logger.error(f"Error sending message: {e}")
+        self._pending.clear()
 
 class OS2LServer:
     """OS2L server implementation
@@ -124,7 +270,9 @@ class OS2LServer:
         self.host = host
         self.port = port
         self.server = None
-        self.connections: Set[OS2LProtocol] = set()
+        self.connections: List[OS2LProtocol] = []
+        self._conn_idx: Dict[OS2LProtocol, int] = {}  # Position of each connection
+        self._pool: List[OS2LProtocol] = []  # Disconnected protocol instances ready for reuse
         self._running = True
         self._aiozc = None
         self._service_info = None
@@ -134,21 +282,71 @@ class OS2LServer:
         self._button_callback = None
         self._command_callback = None
         
-    def set_beat_callback(self, callback: Callable[[Dict[str, Any]], None]):
-        """Set callback for beat messages"""
+        # Message handlers by message class
+        self._dispatch: Dict[type, Callable[[Any], None]] = {
+            BeatMessage: self._on_beat,
+            ButtonMessage: self._on_button,
+            CommandMessage: self._on_command
+        }
+        
+    def _make_protocol(self) -> OS2LProtocol:
+        """Get a protocol for a new connection, reusing a pooled instance if possible
+        
+        Pooling saves rebuilding the protocol object; its receive buffer
+        starts empty and grows with the connection's traffic as before.
+        """
+        return self._pool.pop() if self._pool else OS2LProtocol(self)
+        
+    def configure_transport(self, transport: asyncio.Transport):
+        """Tune a new client transport for small, latency-sensitive frames
+        
+        Disables Nagle's algorithm and sets the write high-water mark to
+        zero so the transport reports backpressure as soon as data queues.
+        
+        Args:
+            transport: Transport of the new connection
+        """
+        try:
+            transport.set_write_buffer_limits(high=0)
+            sock = transport.get_extra_info('socket')
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (OSError, NotImplementedError) as e:
+            logger.debug("Could not configure transport: %s", e)
+            
+    def _add_connection(self, conn: OS2LProtocol):
+        """Track a connected protocol"""
+        self._conn_idx[conn] = len(self.connections)
+        self.connections.append(conn)
+        
+    def _remove_connection(self, conn: OS2LProtocol):
+        """Stop tracking a protocol, moving the last connection into its slot"""
+        i = self._conn_idx.pop(conn, None)
+        if i is None:
+            return  # stop() may have cleared it already
+        conns = self.connections
+        last = conns.pop()
+        if i < len(conns):
+            conns[i] = last
+            self._conn_idx[last] = i
+        
+    def set_beat_callback(self, callback: Optional[Callable[[BeatInfo], None]]):
+        """Set callback for beat messages (None to ignore them)"""
         self._beat_callback = callback
         
-    def set_button_callback(self, callback: Callable[[Dict[str, Any]], None]):
-        """Set callback for button messages"""
+    def set_button_callback(self, callback: Optional[Callable[[ButtonInfo], None]]):
+        """Set callback for button messages (None to ignore them)"""
         self._button_callback = callback
         
-    def set_command_callback(self, callback: Callable[[Dict[str, Any]], None]):
-        """Set callback for command messages"""
+    def set_command_callback(self, callback: Optional[Callable[[CommandInfo], None]]):
+        """Set callback for command messages (None to ignore them)"""
         self._command_callback = callback
         
-    async def handle_message(self, protocol: OS2LProtocol, msg_str: str):
+    def handle_message(self, protocol: OS2LProtocol, msg_str: str):
         """Handle incoming OS2L message
         
+        Runs inline from data_received; callbacks must not block.
+        
         Args:
             protocol: Protocol instance that received the message
             msg_str: Message string
@@ -160,72 +358,81 @@ class OS2LServer:
                 return
                 
             # Handle based on message type
-            if isinstance(message, BeatMessage):
-                if self._beat_callback:
-                    self._beat_callback({
-                        'bpm': message.bpm,
-                        'position': message.pos,
-                        'strength': message.strength,
-                        'change': message.change
-                    })
-                    
-            elif isinstance(message, ButtonMessage):
-                if self._button_callback:
-                    self._button_callback({
-                        'name': message.name,
-                        'page': message.page,
-                        'state': message.state == "on"
-                    })
-                    
-            elif isinstance(message, CommandMessage):
-                if self._command_callback:
-                    self._command_callback({
-                        'id': message.id,
-                        'param': message.param / 100.0  # Convert to 0-1 range
-                    })
-                    
+            handler = self._dispatch.get(type(message))
+            if handler:
+                handler(message)
+                
         except (ProtocolError, ValidationError) as e:
             logger.warning(f"Invalid message: {e}")
         except Exception as e:
-            logger.error(f"Error handling message: {e}\n{traceback.format_exc()}")
+            logger.exception("Error handling message: %s", e)
+            
+    def _on_beat(self, message: BeatMessage):
+        """Pass a beat message to the beat callback"""
+        if self._beat_callback:
+            self._beat_callback(BeatInfo(
+                bpm=message.bpm,
+                position=message.pos,
+                strength=message.strength,
+                change=message.change
+            ))
+            
+    def _on_button(self, message: ButtonMessage):
+        """Pass a button message to the button callback"""
+        if self._button_callback:
+            self._button_callback(ButtonInfo(
+                name=message.name,
+                page=message.page,
+                state=message.state == "on"
+            ))
+            
+    def _on_command(self, message: CommandMessage):
+        """Pass a command message to the command callback"""
+        if self._command_callback:
+            self._command_callback(CommandInfo(
+                id=message.id,
+                param=message.param / 100.0  # Convert to 0-1 range
+            ))
             
     async def send_feedback(self, name: str, page: Optional[str], state: bool):
         """Send feedback to VirtualDJ
         
+        Args:
+            name: Button name
+            page: Page name (optional)
+            state: Button state
+        """
+        self.send_feedback_nowait(name, page, state)
+        
+    def send_feedback_nowait(self, name: str, page: Optional[str], state: bool):
+        """Send feedback to VirtualDJ without awaiting
+        
+        Writes are buffered by the transports, so this never blocks and
+        can be called directly from message callbacks.
+        
         Args:
             name: Button name
             page: Page name (optional)
             state: Button state
         """
         try:
-            # Create feedback message
-            message = FeedbackMessage(name=name, page=page, state=state)
-            
-            # Send to all connections
+            # Encode once (cached per button state) and send to all connections
             if self.connections:
+                payload = _encode_feedback(name, page, bool(state))
+                logger.debug("Sending feedback to %d clients: %r", len(self.connections), payload)
                 for conn in self.connections:
-                    conn.send_message(message.to_json())
+                    conn.send_bytes(payload)
                     
         except Exception as e:
-            logger.error(f"Error sending feedback: {e}\n{traceback.format_exc()}")
+            logger.exception("Error sending feedback: %s", e)
             
     async def register_service(self):
         """Register OS2L service via DNS-SD"""
         try:
             self._aiozc = AsyncZeroconf()
             
-            # Convert IP address to proper format
-            addr_bytes = socket.inet_pton(socket.AF_INET, self.host)
-            
-            # Create service info
-            self._service_info = ServiceInfo(
-                "_os2l._tcp.local.",
-                "LIFX Light Sync._os2l._tcp.local.",
-                addresses=[addr_bytes],
-                port=self.port,
-                properties={},
-                server="lifx-sync.local."
-            )
+            # Create service info (reused across restarts)
+            self._service_info = _build_service_info(self.host, self.port)
             
             # Register service
             await self._aiozc.async_register_service(self._service_info)
@@ -241,7 +448,7 @@ class OS2LServer:
             # Create server
             loop = asyncio.get_running_loop()
             self.server = await loop.create_server(
-                lambda: OS2LProtocol(self),
+                self._make_protocol,
                 self.host,
                 self.port
             )
@@ -256,7 +463,7 @@ class OS2LServer:
                 await self.server.serve_forever()
                 
         except Exception as e:
-            logger.error(f"Error starting server: {e}\n{traceback.format_exc()}")
+            logger.exception("Error starting server: %s", e)
             
     async def stop(self):
         """Stop the OS2L server"""
@@ -270,8 +477,10 @@ class OS2LServer:
         # Close connections
         for conn in self.connections:
             if conn.transport:
+                conn._flush()  # Don't drop frames still waiting to be written
                 conn.transport.close()
         self.connections.clear()
+        self._conn_idx.clear()
         
         # Close server
         if self.server:
@@ -1,15 +1,48 @@
 """Setup script for pulse-dj package"""
 
-from setuptools import setup, find_packages
+import sys
+from setuptools import setup, find_packages, Extension
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+
+# Optional compiled kernels; the analyzer and OS2L server fall back to
+# pure Python without them
+ext_modules = []
+if cythonize is not None:
+    ext_modules = cythonize(
+        [
+            Extension(
+                "pulse.core.audio._analyzer",
+                ["pulse/core/audio/_analyzer.pyx"],
+                extra_compile_args=[] if sys.platform == "win32" else ["-O3", "-ffast-math"]
+            ),
+            Extension(
+                "pulse.core.os2l._scanner",
+                ["pulse/core/os2l/_scanner.pyx"]
+            )
+        ],
+        language_level=3
+    )
 
 setup(
     name="pulse-dj",
     version="0.1.0",
     packages=find_packages(),
+    ext_modules=ext_modules,
     install_requires=[
         "numpy>=1.24.0",
         "zeroconf>=0.115.0",
         "aiolifx>=0.8.9",
         "sounddevice>=0.4.6"
-    ]
+    ],
+    extras_require={
+        "fast": [
+            "scipy>=1.10.0",
+            "orjson>=3.8.0",
+            "uvloop>=0.17.0; sys_platform != 'win32'"
+        ]
+    }
 )
@@ -10,10 +10,12 @@ This test validates:
 import asyncio
 import logging
 import math
+import signal
 import sys
 import time
 from typing import Dict, Any, Optional
 from pulse.core.audio.analyzer import AudioInput
+from pulse.core.loop import use_fast_event_loop
 import sounddevice as sd
 import numpy as np
 
@@ -24,6 +26,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Level bar segments, sliced to length instead of rebuilt per bar
+BAR_LENGTH = 20
+_BAR_FULL = '█' * BAR_LENGTH
+_BAR_EMPTY = '·' * BAR_LENGTH
+
 class AudioTester:
     """Test audio analysis functionality"""
     
@@ -32,6 +39,7 @@ class AudioTester:
         self.audio = None
         self.latest_features = {}
         self._running = True
+        self._stop_event = asyncio.Event()
         
     @staticmethod
     def format_energy(e: float) -> str:
@@ -41,17 +49,29 @@ class AudioTester:
         return f"{e:.2f}"
         
     @staticmethod
-    def format_bar(value: float, max_length: int = 20) -> str:
+    def bar_lengths(values: np.ndarray, max_length: int = BAR_LENGTH) -> np.ndarray:
+        """Compute bar lengths for an array of values"""
+        # Normalize values to 0-1 range using log scale
+        normalized = np.log10(np.maximum(values, 0.0) + 1.0) / 5  # Adjust divisor to change scaling
+        np.clip(normalized, 0.0, 1.0, out=normalized)
+        return (normalized * max_length).astype(np.int32)
+        
+    @staticmethod
+    def render_bar(bar_length: int, max_length: int = BAR_LENGTH) -> str:
+        """Render a bar of the given length"""
+        return '[' + _BAR_FULL[:bar_length] + _BAR_EMPTY[:max_length - bar_length] + ']'
+        
+    @staticmethod
+    def format_bar(value: float, max_length: int = BAR_LENGTH) -> str:
         """Create a visual bar representation of a value"""
         # Normalize value to 0-1 range using log scale
         if value <= 0:
             normalized = 0
         else:
-            normalized = min(1.0, np.log10(value + 1) / 5)  # Adjust divisor to change scaling
+            normalized = min(1.0, math.log10(value + 1) / 5)  # Adjust divisor to change scaling
             
         # Create bar
-        bar_length = int(normalized * max_length)
-        return '[' + '█' * bar_length + '·' * (max_length - bar_length) + ']'
+        return AudioTester.render_bar(int(normalized * max_length), max_length)
         
     @staticmethod
     def format_band_name(name: str, width: int = 10) -> str:
@@ -60,23 +80,28 @@ class AudioTester:
         
     def print_levels(self, features: Dict[str, Any]):
         """Print audio levels and beat information"""
-        # Clear line and print header
-        print("\r", end="")
+        # Build the whole line, starting with a carriage return to clear it
+        parts = ["\r"]
         
-        # Print each frequency band
-        for band, energy in features.get('band_energies', {}).items():
-            bar = self.format_bar(energy)
+        # Each frequency band, with all bar lengths computed at once
+        band_energies = features.get('band_energies', {})
+        energies = np.fromiter(band_energies.values(), dtype=np.float64, count=len(band_energies))
+        lengths = self.bar_lengths(energies).tolist()
+        for (band, energy), bar_length in zip(band_energies.items(), lengths):
+            bar = self.render_bar(bar_length)
             name = self.format_band_name(band)
-            print(f"{name}{bar} {self.format_energy(energy)} | ", end="")
+            parts.append(f"{name}{bar} {self.format_energy(energy)} | ")
             
-        # Print volume level
+        # Volume level
         volume = features.get('volume_level', 0)
-        print(f"Vol: {self.format_bar(volume)} {self.format_energy(volume)}", end="")
+        parts.append(f"Vol: {self.format_bar(volume)} {self.format_energy(volume)}")
         
-        # Print beat information if detected
+        # Beat information if detected
         if features.get('is_beat', False):
-            print(f"\nBEAT! Strength: {features.get('beat_strength', 0):.2f}")
+            parts.append(f"\nBEAT! Strength: {features.get('beat_strength', 0):.2f}\n")
             
+        # One write and flush per update
+        sys.stdout.write(''.join(parts))
         sys.stdout.flush()
         
     @staticmethod
@@ -147,9 +172,14 @@ class AudioTester:
             # Start audio capture
             self.audio.start()
             
+            # Stop on Ctrl+C (signal handlers are not available on Windows)
+            try:
+                asyncio.get_running_loop().add_signal_handler(signal.SIGINT, self._stop_event.set)
+            except NotImplementedError:
+                pass
+                
             # Keep running until interrupted
-            while self._running:
-                await asyncio.sleep(0.1)
+            await self._stop_event.wait()
                 
         except KeyboardInterrupt:
             logger.info("\nStopping audio capture...")
@@ -161,6 +191,7 @@ class AudioTester:
     async def cleanup(self):
         """Clean up resources"""
         self._running = False
+        self._stop_event.set()
         
         if self.audio:
             try:
@@ -204,6 +235,8 @@ if __name__ == "__main__":
             if sys.platform == 'win32':
                 # Set up event loop policy for Windows
                 asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+            else:
+                use_fast_event_loop()
             asyncio.run(main(args.device))
     except KeyboardInterrupt:
         pass  # Handle Ctrl+C gracefully
@@ -0,0 +1,149 @@
+"""Test EffectManager scheduling
+
+Runs the effect tick loop against fake lights, so no hardware is needed.
+This test validates:
+1. Music effect resumes when features arrive after it starts
+2. Switching effects mid-send takes effect without waiting out the frame
+3. Switching to STATIC stops the previous effect
+"""
+
+import asyncio
+import logging
+import time
+
+from pulse.core.lights.controller import LIFXController
+from pulse.core.lights.effects import EffectManager, EffectType, EffectParams
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class FakeLight:
+    """Light stand-in that records the colors it is sent"""
+
+    def __init__(self, index: int):
+        self.mac_addr = f"d0:73:d5:00:00:{index:02x}"
+        self.ip_addr = f"10.0.0.{index}"
+        self.colors = []
+
+    def set_power(self, *args, **kwargs):
+        pass
+
+    def set_color(self, hsbk, duration=0):
+        self.colors.append(hsbk)
+
+def make_controller(count: int = 3) -> LIFXController:
+    """Create a controller with fake lights registered"""
+    controller = LIFXController()
+    for i in range(count):
+        controller.register(FakeLight(i))
+    return controller
+
+def count_frames(controller: LIFXController) -> int:
+    """Count frames sent to the first light"""
+    return len(controller.get_lights()[0].colors)
+
+def track_sends(controller: LIFXController, manager: EffectManager, delay: float = 0.02):
+    """Slow down frame sends and record which effect each one came from
+    
+    Returns:
+        Tuple of (sends, sending) where sends lists (time, effect type)
+        per send and sending is set while a send is in progress
+    """
+    sends = []
+    sending = asyncio.Event()
+    send = controller.set_color_many
+
+    async def slow_send(*args, **kwargs):
+        sends.append((time.monotonic(), manager._active_effect.type))
+        sending.set()
+        try:
+            await asyncio.sleep(delay)  # Like a real network send
+            return await send(*args, **kwargs)
+        finally:
+            sending.clear()
+
+    controller.set_color_many = slow_send
+    return sends, sending
+
+async def _music_resumes_after_features():
+    controller = make_controller()
+    manager = EffectManager(controller)
+    try:
+        # Nothing to render until features arrive
+        manager.start_effect(EffectType.MUSIC)
+        await asyncio.sleep(0.1)
+        assert count_frames(controller) == 0, "Music rendered without features"
+
+        # Feed features at 20 Hz; each one should produce a frame
+        for i in range(20):
+            level = (i % 10) / 10
+            manager.update_features({'bass': level, 'mids': 0.5, 'highs': 1 - level})
+            await asyncio.sleep(0.05)
+
+        sent = count_frames(controller)
+        assert sent >= 10, f"Music sent {sent} frames for 20 feature updates"
+        logger.info("Music resumed: %d frames", sent)
+    finally:
+        await manager.cleanup()
+
+def test_music_resumes_after_features():
+    """Test that a music effect started before any features keeps rendering"""
+    asyncio.run(_music_resumes_after_features())
+
+async def _switch_mid_send():
+    controller = make_controller()
+    manager = EffectManager(controller)
+    sends, sending = track_sends(controller, manager)
+    try:
+        # Pulse holds its frames far longer than the 20 ms send
+        manager.start_effect(EffectType.PULSE, EffectParams(intensity=1.0))
+        await asyncio.wait_for(sending.wait(), 1)
+        
+        # Switch while the pulse frame is still being sent
+        switched = time.monotonic()
+        manager.start_effect(EffectType.STROBE)
+        await asyncio.sleep(0.2)
+        
+        strobe = [t for t, effect_type in sends if effect_type is EffectType.STROBE]
+        assert strobe, "Strobe never started"
+        delay = strobe[0] - switched
+        assert delay < 0.05, f"Switch took {delay:.3f}s"
+        logger.info("Switched mid-send in %.3fs", delay)
+    finally:
+        await manager.cleanup()
+
+def test_switch_mid_send():
+    """Test that a switch issued during a send is not lost"""
+    asyncio.run(_switch_mid_send())
+
+async def _static_switch():
+    controller = make_controller()
+    manager = EffectManager(controller)
+    sends, sending = track_sends(controller, manager)
+    try:
+        manager.start_effect(EffectType.STROBE, EffectParams(speed=2.0))
+        await asyncio.wait_for(sending.wait(), 1)
+        
+        # STATIC has no effect class; the strobe must stop at once
+        before = len(sends)
+        manager.start_effect(EffectType.STATIC)
+        await asyncio.sleep(0.5)
+        after = len(sends) - before
+        assert after == 0, f"Stopped strobe sent {after} frames after switching to static"
+        logger.info("Switched to static")
+    finally:
+        await manager.cleanup()
+
+def test_static_switch():
+    """Test that switching to STATIC stops the previous effect"""
+    asyncio.run(_static_switch())
+
+if __name__ == "__main__":
+    test_music_resumes_after_features()
+    test_switch_mid_send()
+    test_static_switch()
+    logger.info("Tests complete!")
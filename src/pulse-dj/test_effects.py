@@ -9,10 +9,11 @@ This test validates:
 
 import asyncio
 import logging
-import math
 import time
 from typing import Dict, Any, List, Tuple
-from pulse.core.lights.controller import LIFXController, LIFXLight, Waveform, LIFXError
+
+import numpy as np
+from pulse.core.lights.controller import LIFXController, LightColor, LIFXLight, Waveform, LIFXError
 from pulse.core.lights.effects import VirtualDJEffect
 from pulse.core.os2l.protocol import BeatMessage, ButtonMessage, CommandMessage
 
@@ -62,22 +63,26 @@ def create_test_beat(bpm: float, position: int, strength: float) -> Dict[str, An
         'change': False
     }
 
+# Test bands and their oscillation rates (half-cycles per unit t)
+_BAND_NAMES = ('sub_bass', 'bass', 'low_mid', 'mid', 'high_mid', 'high')
+_BAND_RATES = (2, 3, 4, 5, 6, 7)
+
+# |sin(rate * pi * t)| sampled once over one period of t; shape (1024, 6)
+_BAND_TABLE_SIZE = 1024
+_BAND_TABLE = np.abs(np.sin(
+    np.outer(np.arange(_BAND_TABLE_SIZE) / _BAND_TABLE_SIZE, _BAND_RATES) * np.pi
+)).tolist()
+
 def create_test_audio_features(t: float) -> Dict[str, Any]:
     """Create test audio features with frequency bands
     
     Args:
         t: Time value (0-1) for oscillation
     """
-    # Create oscillating energy values for each frequency band
+    # Look up oscillating energy values for each frequency band
+    row = _BAND_TABLE[int(t * _BAND_TABLE_SIZE) % _BAND_TABLE_SIZE]
     return {
-        'band_energies': {
-            'sub_bass': abs(math.sin(t * 2 * math.pi)),
-            'bass': abs(math.sin(t * 3 * math.pi)),
-            'low_mid': abs(math.sin(t * 4 * math.pi)),
-            'mid': abs(math.sin(t * 5 * math.pi)),
-            'high_mid': abs(math.sin(t * 6 * math.pi)),
-            'high': abs(math.sin(t * 7 * math.pi))
-        }
+        'band_energies': dict(zip(_BAND_NAMES, row))
     }
 
 async def test_waveforms(controller: LIFXController):
@@ -113,9 +118,8 @@ async def test_waveforms(controller: LIFXController):
             logger.info(f"\nTesting {name} waveform")
             
             # Set all lights to off first
-            off = (0, 0, 0, 3500)  # Off state
-            tasks = [light.set_color(off, duration=0) for light in controller.lights]
-            await asyncio.gather(*tasks)
+            off = LightColor(0, 0, 0, 3500)  # Off state
+            await controller.set_color_all(off, duration=0)
             await asyncio.sleep(1)
             
             # Apply waveform to all lights
@@ -136,8 +140,7 @@ async def test_waveforms(controller: LIFXController):
             await asyncio.sleep(6)  # 2 seconds * 3 cycles
             
             # Set back to off
-            tasks = [light.set_color(off, duration=0) for light in controller.lights]
-            await asyncio.gather(*tasks)
+            await controller.set_color_all(off, duration=0)
             await asyncio.sleep(1)  # Pause between effects
             
         except Exception as e:
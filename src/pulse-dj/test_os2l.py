@@ -9,11 +9,19 @@ This test verifies that our OS2L server:
 
 import asyncio
 import logging
+import signal
 import sys
-import traceback
-from typing import Dict, Any, Optional
+from pulse.core.log import CallbackErrorLogger
+from pulse.core.loop import use_fast_event_loop
 from pulse.core.os2l.server import OS2LServer
-from pulse.core.os2l.protocol import BeatMessage, ButtonMessage, CommandMessage
+from pulse.core.os2l.protocol import (
+    BeatInfo,
+    BeatMessage,
+    ButtonInfo,
+    ButtonMessage,
+    CommandInfo,
+    CommandMessage
+)
 
 # Set up logging
 logging.basicConfig(
@@ -22,53 +30,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_RULE = "=" * 80
+
+# Setup instructions, written in one call at startup
+_INSTRUCTIONS = f"""
+OS2L Server Test
+{_RULE}
+
+1. Enable OS2L in VirtualDJ:
+   - Open VirtualDJ
+   - Go to Options > Preferences
+   - Select Network tab
+   - Enable OS2L option
+
+2. Test Features:
+   - Play music to test beat detection
+   - Use DMX pads to test buttons
+   - Use faders to test commands
+   - Check VirtualDJ UI for feedback
+
+3. Press Ctrl+C to exit
+
+Waiting for VirtualDJ to connect...
+
+{_RULE}
+
+"""
+
 class OS2LTest:
     """Test OS2L server functionality"""
     
     def __init__(self):
         self.server = OS2LServer()
         self._running = True
-        self._shutdown_event = asyncio.Event()
-        self._cleanup_complete = asyncio.Event()
+        self._log_callback_error = CallbackErrorLogger(logger)
         
-    def _on_beat(self, beat_info: Dict[str, Any]):
+    def _on_beat(self, beat_info: BeatInfo):
         """Handle beat updates"""
         try:
             logger.info(
-                f"Beat: BPM={beat_info['bpm']:.1f}, "
-                f"Position={beat_info['position']}, "
-                f"Strength={beat_info['strength']:.1f}"
+                "Beat: BPM=%.1f, Position=%s, Strength=%.1f",
+                beat_info.bpm, beat_info.position, beat_info.strength
             )
         except Exception as e:
-            logger.error(f"Error in beat callback: {e}\n{traceback.format_exc()}")
+            self._log_callback_error("beat", e)
             
-    def _on_button(self, button_info: Dict[str, Any]):
+    def _on_button(self, button_info: ButtonInfo):
         """Handle button updates"""
         try:
             # Log button press
-            state = "pressed" if button_info['state'] else "released"
-            logger.info(f"Button {button_info['name']} {state}")
+            state = "pressed" if button_info.state else "released"
+            logger.info("Button %s %s", button_info.name, state)
             
             # Send feedback to VirtualDJ
-            asyncio.create_task(
-                self.server.send_feedback(
-                    name=button_info['name'],
-                    page=button_info.get('page'),
-                    state=button_info['state']
-                )
+            self.server.send_feedback_nowait(
+                name=button_info.name,
+                page=button_info.page,
+                state=button_info.state
             )
             
         except Exception as e:
-            logger.error(f"Error in button callback: {e}\n{traceback.format_exc()}")
+            self._log_callback_error("button", e)
             
-    def _on_command(self, command_info: Dict[str, Any]):
+    def _on_command(self, command_info: CommandInfo):
         """Handle command updates"""
         try:
             # Log command
-            logger.info(f"Command {command_info['id']} = {command_info['param']:.1%}")
+            logger.info("Command %s = %.1f%%", command_info.id, command_info.param * 100)
             
         except Exception as e:
-            logger.error(f"Error in command callback: {e}\n{traceback.format_exc()}")
+            self._log_callback_error("command", e)
             
     async def start(self):
         """Start the test"""
@@ -78,41 +109,30 @@ class OS2LTest:
             self.server.set_button_callback(self._on_button)
             self.server.set_command_callback(self._on_command)
             
-            # Start OS2L server
-            logger.info("Starting OS2L server...")
-            server_task = asyncio.create_task(self.server.start())
-            
             # Print instructions
-            print("\nOS2L Server Test")
-            print("=" * 80)
-            print("\n1. Enable OS2L in VirtualDJ:")
-            print("   - Open VirtualDJ")
-            print("   - Go to Options > Preferences")
-            print("   - Select Network tab")
-            print("   - Enable OS2L option")
-            print("\n2. Test Features:")
-            print("   - Play music to test beat detection")
-            print("   - Use DMX pads to test buttons")
-            print("   - Use faders to test commands")
-            print("   - Check VirtualDJ UI for feedback")
-            print("\n3. Press Ctrl+C to exit")
-            print("\nWaiting for VirtualDJ to connect...\n")
-            print("=" * 80 + "\n")
-            
-            # Wait for shutdown signal
-            await self._shutdown_event.wait()
+            sys.stdout.write(_INSTRUCTIONS)
+            sys.stdout.flush()
             
-            # Cancel server task
-            server_task.cancel()
-            try:
-                await server_task
-            except asyncio.CancelledError:
-                pass
+            # Run OS2L server until shutdown
+            logger.info("Starting OS2L server...")
+            await self._serve()
             
         except Exception as e:
-            logger.error(f"Error in test: {e}\n{traceback.format_exc()}")
+            logger.exception("Error in test: %s", e)
             await self.cleanup()
             
+    async def _serve(self):
+        """Run the OS2L server until cancelled"""
+        if sys.version_info >= (3, 11):
+            # Cancelling the caller cancels the server task with the group
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self.server.start(), name="os2l")
+            return
+            
+        # Cancelling the caller also cancels the awaited server task
+        server_task = asyncio.create_task(self.server.start())
+        await server_task
+            
     async def cleanup(self):
         """Clean up resources"""
         if not self._running:
@@ -123,66 +143,64 @@ class OS2LTest:
         
         # Stop OS2L server
         try:
-            await self.server.stop()
+            # Shielded so a late cancellation can't leave it half-stopped
+            await asyncio.shield(self.server.stop())
             logger.info("OS2L server stopped")
         except Exception as e:
             logger.error(f"Error stopping server: {e}")
             
         logger.info("Cleanup complete")
-        self._cleanup_complete.set()
-        
-    def request_shutdown(self):
-        """Request graceful shutdown"""
-        if self._running:
-            logger.info("Shutdown requested")
-            self._shutdown_event.set()
 
 async def main():
     """Main entry point"""
     test = OS2LTest()
+    main_task = asyncio.current_task()
     
     def signal_handler():
         """Handle shutdown signals"""
-        if not test._shutdown_event.is_set():
-            test.request_shutdown()
+        if test._running:
+            logger.info("Shutdown requested")
+            main_task.cancel()
     
     try:
         # Set up signal handlers
         loop = asyncio.get_running_loop()
         if sys.platform != "win32":
             # Use signal handlers on non-Windows platforms
-            for sig in ('SIGINT', 'SIGTERM'):
-                loop.add_signal_handler(getattr(signal, sig), signal_handler)
+            loop.add_signal_handler(signal.SIGINT, signal_handler)
+            loop.add_signal_handler(signal.SIGTERM, signal_handler)
         else:
             # Windows workaround
             def win_handler(type, frame):
                 signal_handler()
                 return True
-            import signal
             signal.signal(signal.SIGINT, win_handler)
             signal.signal(signal.SIGTERM, win_handler)
         
-        # Start test and wait for completion
-        await test.start()
-        await test._cleanup_complete.wait()
+        # Run until finished or cancelled by a signal
+        try:
+            await test.start()
+        except asyncio.CancelledError:
+            if hasattr(main_task, 'uncancel'):
+                main_task.uncancel()  # Let cleanup await normally
         
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received")
-        test.request_shutdown()
-        await test._cleanup_complete.wait()
     except Exception as e:
-        logger.error(f"Error in main: {e}\n{traceback.format_exc()}")
-        test.request_shutdown()
-        await test._cleanup_complete.wait()
+        logger.exception("Error in main: %s", e)
+    finally:
+        await test.cleanup()
 
 if __name__ == "__main__":
     try:
         if sys.platform == 'win32':
             # Set up event loop policy for Windows
             asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        else:
+            use_fast_event_loop()
         asyncio.run(main())
     except KeyboardInterrupt:
         pass  # Handle Ctrl+C gracefully
     except Exception as e:
-        logger.error(f"Fatal error: {e}\n{traceback.format_exc()}")
+        logger.exception("Fatal error: %s", e)
         sys.exit(1)
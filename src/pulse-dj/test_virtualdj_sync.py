@@ -6,28 +6,64 @@ It handles beat detection to control light effects in real-time.
 
 import asyncio
 import logging
+import os
 import signal
 import sys
-import traceback
-from typing import Dict, Any, Optional, Set
+from typing import Any
 from contextlib import AsyncExitStack
+from weakref import WeakSet
 
 from pulse.core.lights.controller import LIFXController
+from pulse.core.log import CallbackErrorLogger
+from pulse.core.loop import use_fast_event_loop
 from pulse.core.os2l.server import OS2LServer
-from pulse.core.os2l.protocol import BeatMessage, ButtonMessage, CommandMessage
+from pulse.core.os2l.protocol import (
+    BeatInfo,
+    BeatMessage,
+    ButtonInfo,
+    ButtonMessage,
+    CommandInfo,
+    CommandMessage
+)
 from pulse.core.lights.effects import EffectManager, EffectType, EffectParams
 
 # Set up logging
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=logging.INFO,
     format='%(asctime)s%(msecs)03d - %(name)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 logger = logging.getLogger(__name__)
 
-# Enable debug logging for all modules
-logging.getLogger('pulse').setLevel(logging.DEBUG)
-logging.getLogger('aiolifx').setLevel(logging.DEBUG)
+# Debug logging (one record per beat) is opt-in: set PULSE_DEBUG=1
+if os.environ.get('PULSE_DEBUG'):
+    logging.getLogger('pulse').setLevel(logging.DEBUG)
+    logging.getLogger('aiolifx').setLevel(logging.DEBUG)
+    logger.setLevel(logging.DEBUG)
+
+_RULE = "=" * 80
+
+# Setup instructions, written in one call at startup
+_INSTRUCTIONS = f"""
+VirtualDJ Light Sync
+{_RULE}
+
+1. Enable OS2L in VirtualDJ:
+   - Open VirtualDJ
+   - Go to Options > Preferences
+   - Select Network tab
+   - Enable OS2L option
+
+2. Using the System:
+   - Play music in VirtualDJ
+   - Lights will automatically pulse in sync with the beat
+   - Beat strength controls pulse intensity
+
+Starting up...
+
+{_RULE}
+
+"""
 
 class VirtualDJSync:
     """Synchronizes LIFX lights with Virtual DJ"""
@@ -40,89 +76,76 @@ class VirtualDJSync:
         
         # State
         self._running = True
-        self._shutdown_event = asyncio.Event()
-        self._cleanup_complete = asyncio.Event()
-        self._tasks: Set[asyncio.Task] = set()
+        self._tasks: "WeakSet[asyncio.Task]" = WeakSet()  # Owners hold the strong refs
         self._exit_stack = AsyncExitStack()
+        self._log_callback_error = CallbackErrorLogger(logger)
+        
+        # Pulse parameters for each whole beat strength (0-100), shared across beats
+        self._params_cache = [EffectParams(intensity=i / 100.0) for i in range(101)]
+        
+        # Bound once for the beat callback
+        self._update_timing = self.effect_manager.update_timing
+        self._start_effect = self.effect_manager.start_effect
+        self._pulse_type = EffectType.PULSE
         
-    def _on_beat(self, beat: Dict[str, Any]) -> None:
+    def _on_beat(self, beat: BeatInfo) -> None:
         """Handle beat updates from Virtual DJ
         
         Args:
             beat: Beat message from VirtualDJ
         """
-        if not self._running:
-            return
-            
         try:
-            logger.debug(
-                f"Beat: BPM={beat['bpm']:.1f}, "
-                f"Pos={beat['position']}, "
-                f"Strength={beat['strength']:.1f}, "
-                f"Change={beat['change']}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Beat: BPM=%.1f, Pos=%s, Strength=%.1f, Change=%s",
+                    beat.bpm, beat.position, beat.strength, beat.change
+                )
             
             # Update effect timing
-            self.effect_manager.update_timing(beat['bpm'])
+            self._update_timing(beat.bpm)
             
-            # Start or update pulse effect
-            params = EffectParams(
-                intensity=beat['strength'] / 100.0  # Convert 0-100 to 0-1
-            )
+            # Pulse intensity from beat strength (validated to 0-100 by the parser)
+            params = self._params_cache[round(beat.strength)]
             
-            # Create task to start effect
-            task = asyncio.create_task(
-                self.effect_manager.start_effect(EffectType.PULSE, params)
-            )
-            self._tasks.add(task)
-            task.add_done_callback(self._tasks.discard)
+            # Start (or restart) the pulse for this beat
+            self._start_effect(self._pulse_type, params)
             
         except Exception as e:
-            logger.error(f"Error in beat callback: {e}\n{traceback.format_exc()}")
+            self._log_callback_error("beat", e)
             
-    def _on_button(self, button: Dict[str, Any]) -> None:
+    def _on_button(self, button: ButtonInfo) -> None:
         """Handle button updates from Virtual DJ
         
         Args:
             button: Button message from VirtualDJ
         """
-        if not self._running:
-            return
-            
         try:
             # Log button press
-            state = "pressed" if button['state'] else "released"
-            logger.info(f"Button {button['name']} {state}")
+            state = "pressed" if button.state else "released"
+            logger.info("Button %s %s", button.name, state)
             
             # Send feedback to VirtualDJ
-            task = asyncio.create_task(
-                self.os2l_server.send_feedback(
-                    name=button['name'],
-                    page=button.get('page'),
-                    state=button['state']
-                )
+            self.os2l_server.send_feedback_nowait(
+                name=button.name,
+                page=button.page,
+                state=button.state
             )
-            self._tasks.add(task)
-            task.add_done_callback(self._tasks.discard)
             
         except Exception as e:
-            logger.error(f"Error in button callback: {e}\n{traceback.format_exc()}")
+            self._log_callback_error("button", e)
             
-    def _on_command(self, cmd: Dict[str, Any]) -> None:
+    def _on_command(self, cmd: CommandInfo) -> None:
         """Handle command updates from Virtual DJ
         
         Args:
             cmd: Command message from VirtualDJ
         """
-        if not self._running:
-            return
-            
         try:
             # Log command
-            logger.info(f"Command {cmd['id']} = {cmd['param']:.1%}")
+            logger.info("Command %s = %.1f%%", cmd.id, cmd.param * 100)
             
         except Exception as e:
-            logger.error(f"Error in command callback: {e}\n{traceback.format_exc()}")
+            self._log_callback_error("command", e)
             
     async def start(self) -> None:
         """Start the Virtual DJ sync"""
@@ -145,25 +168,27 @@ class VirtualDJSync:
             self.os2l_server.set_button_callback(self._on_button)
             self.os2l_server.set_command_callback(self._on_command)
             
-            # Start OS2L server
+            # Run OS2L server until shutdown
             logger.info("Starting OS2L server...")
-            server_task = asyncio.create_task(self.os2l_server.start())
-            self._tasks.add(server_task)
-            
-            # Wait for shutdown signal
-            await self._shutdown_event.wait()
-            
-            # Cancel server task
-            server_task.cancel()
-            try:
-                await server_task
-            except asyncio.CancelledError:
-                pass
+            await self._serve()
             
         except Exception as e:
-            logger.error(f"Error in Virtual DJ sync: {e}\n{traceback.format_exc()}")
+            logger.exception("Error in Virtual DJ sync: %s", e)
             await self.cleanup()
             
+    async def _serve(self) -> None:
+        """Run the OS2L server until cancelled"""
+        if sys.version_info >= (3, 11):
+            # Cancelling the caller cancels the server task with the group
+            async with asyncio.TaskGroup() as tg:
+                self._tasks.add(tg.create_task(self.os2l_server.start(), name="os2l"))
+            return
+            
+        # Cancelling the caller also cancels the awaited server task
+        server_task = asyncio.create_task(self.os2l_server.start())
+        self._tasks.add(server_task)
+        await server_task
+            
     async def cleanup(self) -> None:
         """Clean up resources"""
         if not self._running:
@@ -172,20 +197,26 @@ class VirtualDJSync:
         self._running = False
         logger.info("Starting cleanup...")
         
-        # Cancel all pending tasks
-        for task in self._tasks:
-            task.cancel()
-            
-        if self._tasks:
-            await asyncio.gather(*self._tasks, return_exceptions=True)
+        # Detach callbacks so the server drops messages from here on
+        self.os2l_server.set_beat_callback(None)
+        self.os2l_server.set_button_callback(None)
+        self.os2l_server.set_command_callback(None)
+        
+        # Cancel all pending tasks in one pass, then wait for them together
+        tasks = list(self._tasks)
         self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
         
         # Clean up resources
         await self._exit_stack.aclose()
         
         # Stop OS2L server
         try:
-            await self.os2l_server.stop()
+            # Shielded so a late cancellation can't leave it half-stopped
+            await asyncio.shield(self.os2l_server.stop())
             logger.info("OS2L server stopped")
         except Exception as e:
             logger.error(f"Error stopping OS2L server: {e}")
@@ -205,49 +236,30 @@ class VirtualDJSync:
             logger.error(f"Error cleaning up LIFX controller: {e}")
             
         logger.info("Cleanup complete")
-        self._cleanup_complete.set()
         
-    def request_shutdown(self) -> None:
-        """Request graceful shutdown"""
-        if self._running:
-            logger.info("Shutdown requested")
-            self._shutdown_event.set()
-            
     def _print_instructions(self) -> None:
         """Print setup instructions"""
-        print("\nVirtualDJ Light Sync")
-        print("=" * 80)
-        
-        print("\n1. Enable OS2L in VirtualDJ:")
-        print("   - Open VirtualDJ")
-        print("   - Go to Options > Preferences")
-        print("   - Select Network tab")
-        print("   - Enable OS2L option")
-        
-        print("\n2. Using the System:")
-        print("   - Play music in VirtualDJ")
-        print("   - Lights will automatically pulse in sync with the beat")
-        print("   - Beat strength controls pulse intensity")
-        
-        print("\nStarting up...\n")
-        print("=" * 80 + "\n")
+        sys.stdout.write(_INSTRUCTIONS)
+        sys.stdout.flush()
 
 async def main() -> None:
     """Main entry point"""
     sync = VirtualDJSync()
+    main_task = asyncio.current_task()
     
     def signal_handler() -> None:
         """Handle shutdown signals"""
-        if not sync._shutdown_event.is_set():
-            sync.request_shutdown()
+        if sync._running:
+            logger.info("Shutdown requested")
+            main_task.cancel()
     
     try:
         # Set up signal handlers
         loop = asyncio.get_running_loop()
         if sys.platform != "win32":
             # Use signal handlers on non-Windows platforms
-            for sig in ('SIGINT', 'SIGTERM'):
-                loop.add_signal_handler(getattr(signal, sig), signal_handler)
+            loop.add_signal_handler(signal.SIGINT, signal_handler)
+            loop.add_signal_handler(signal.SIGTERM, signal_handler)
         else:
             # Windows workaround
             def win_handler(type: Any, frame: Any) -> bool:
@@ -256,27 +268,30 @@ async def main() -> None:
             signal.signal(signal.SIGINT, win_handler)
             signal.signal(signal.SIGTERM, win_handler)
         
-        # Start sync and wait for completion
-        await sync.start()
-        await sync._cleanup_complete.wait()
+        # Run until finished or cancelled by a signal
+        try:
+            await sync.start()
+        except asyncio.CancelledError:
+            if hasattr(main_task, 'uncancel'):
+                main_task.uncancel()  # Let cleanup await normally
         
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received")
-        sync.request_shutdown()
-        await sync._cleanup_complete.wait()
     except Exception as e:
-        logger.error(f"Error in main: {e}\n{traceback.format_exc()}")
-        sync.request_shutdown()
-        await sync._cleanup_complete.wait()
+        logger.exception("Error in main: %s", e)
+    finally:
+        await sync.cleanup()
 
 if __name__ == "__main__":
     try:
         if sys.platform == 'win32':
             # Set up event loop policy for Windows
             asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        else:
+            use_fast_event_loop()
         asyncio.run(main())
     except KeyboardInterrupt:
         pass  # Handle Ctrl+C gracefully
     except Exception as e:
-        logger.error(f"Fatal error: {e}\n{traceback.format_exc()}")
+        logger.exception("Fatal error: %s", e)
         sys.exit(1)